@@ -0,0 +1,49 @@
+"""
+Build script for the optional Cython elevation kernel (src/_solar_cy.pyx).
+
+    python setup.py build_ext --inplace
+
+The extension is optional: without Cython or a C compiler the build is skipped with a
+warning and src.solar.get_solar_positions_fast falls back to pvlib.
+"""
+
+import warnings
+
+from setuptools import Extension, setup
+from setuptools.command.build_ext import build_ext
+
+
+class OptionalBuildExt(build_ext):
+    """build_ext that warns instead of failing when an extension cannot be built."""
+
+    def run(self):
+        try:
+            super().run()
+        except Exception as exc:  # Missing compiler, headers, ...
+            warnings.warn(f"Skipping optional C extensions: {exc}")
+
+    def build_extension(self, ext):
+        try:
+            super().build_extension(ext)
+        except Exception as exc:
+            warnings.warn(f"Skipping optional extension {ext.name}: {exc}")
+
+
+try:
+    from Cython.Build import cythonize
+
+    ext_modules = cythonize(
+        [Extension("src._solar_cy", ["src/_solar_cy.pyx"])],
+        compiler_directives={"language_level": 3},
+    )
+except ImportError:
+    warnings.warn("Cython is not installed; skipping the src._solar_cy extension.")
+    ext_modules = []
+
+
+setup(
+    name="arbalete-sunshine",
+    packages=["src"],
+    ext_modules=ext_modules,
+    cmdclass={"build_ext": OptionalBuildExt},
+)
@@ -0,0 +1,71 @@
+# cython: language_level=3, boundscheck=False, wraparound=False, cdivision=True
+# distutils: extra_compile_args = -O3
+"""
+Cython solar elevation kernel of the Arbalete Sunlight Analysis project.
+
+Same low-precision analytical model as src/solar_fast.py (US Naval Observatory almanac
+formulas, about 0.01 degrees from the SPA elevation between 1950 and 2050), compiled
+ahead of time so that no JIT warm-up is needed. Build it in place with:
+
+    python setup.py build_ext --inplace
+
+src.solar.get_solar_positions_fast uses it when the extension is importable and falls
+back to pvlib otherwise.
+
+Functions:
+    - elevations(unixtime: double[::1], lat: float, lon: float) -> np.ndarray
+"""
+
+import numpy as np
+
+from libc.math cimport asin, atan2, cos, fmod, sin, sqrt, M_PI
+
+cdef double DEG = M_PI / 180.0
+# Julian day of the Unix epoch and of the J2000.0 epoch.
+cdef double JD_UNIX_EPOCH = 2440587.5
+cdef double J2000 = 2451545.0
+
+
+cdef double _elevation(double unixtime, double lat, double lon) noexcept nogil:
+    """
+    Geometric solar elevation (no refraction) in degrees at a Unix time, for a location
+    given in degrees.
+    """
+    cdef double n = unixtime / 86400.0 + JD_UNIX_EPOCH - J2000
+    cdef double mean_lon = fmod(280.460 + 0.9856474 * n, 360.0) * DEG
+    cdef double mean_anom = fmod(357.528 + 0.9856003 * n, 360.0) * DEG
+    cdef double ecl_lon = (
+        mean_lon + 1.915 * DEG * sin(mean_anom) + 0.020 * DEG * sin(2.0 * mean_anom)
+    )
+    cdef double obliquity = (23.439 - 0.0000004 * n) * DEG
+    cdef double right_asc = atan2(cos(obliquity) * sin(ecl_lon), cos(ecl_lon))
+    cdef double sin_dec = sin(obliquity) * sin(ecl_lon)
+    cdef double cos_dec = sqrt(1.0 - sin_dec * sin_dec)
+    # Greenwich mean sidereal time (the series is in degrees).
+    cdef double gmst = fmod(280.46061837 + 360.98564736629 * n, 360.0) * DEG
+    cdef double hour_angle = gmst + lon * DEG - right_asc
+    cdef double sin_elev = (
+        sin(lat * DEG) * sin_dec + cos(lat * DEG) * cos_dec * cos(hour_angle)
+    )
+    return asin(sin_elev) / DEG
+
+
+def elevations(const double[::1] unixtime, double lat, double lon):
+    """
+    Compute the solar elevation for each Unix time at one location.
+
+    Args:
+        unixtime: Contiguous float64 array of seconds since the epoch (UTC).
+        lat: Latitude in degrees.
+        lon: Longitude in degrees (east positive).
+
+    Returns:
+        A float64 array of solar elevations in degrees, one per time.
+    """
+    cdef Py_ssize_t i, n = unixtime.shape[0]
+    out = np.empty(n, dtype=np.float64)
+    cdef double[::1] out_view = out
+    with nogil:
+        for i in range(n):
+            out_view[i] = _elevation(unixtime[i], lat, lon)
+    return out
@@ -5,6 +5,7 @@ Contains global constants such as GPS coordinates, timezone, and date format.
 https://map.sitg.ge.ch/app/
 """
 
+import os
 from typing import Final
 
 LATITUDE: Final[float] = 46.202836
@@ -19,4 +20,8 @@ TERRACE_CORNERS: Final[dict[str, tuple[float, float]]] = {
     "SE": (46.202800, 6.151700),
 }
 SOURCE_EPSG = "EPSG:2056"
-TARGET_EPSG = "EPSG:4326"
\ No newline at end of file
+TARGET_EPSG = "EPSG:4326"
+# joblib disk cache of elevations, anchored on the repository root like the data paths.
+SOLAR_CACHE_DIR: Final[str] = os.path.join(
+    os.path.abspath(os.path.join(os.path.dirname(__file__), "..")), ".cache", "solar"
+)
@@ -2,11 +2,16 @@ import os
 import requests
 import pandas as pd
 import zipfile
-import io
+import shutil
+import tempfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from tqdm import tqdm
 import csv
 
-def download_and_extract_gml(url, data_dir, filename=None):
+# Size of the copy buffer used when streaming downloads and extracted files to disk.
+CHUNK_SIZE = 1024 * 1024
+
+def download_and_extract_gml(url, data_dir, filename=None, session=None):
     """
     Download a zip file from URL, extract GML file, and save it to data directory
     
@@ -14,54 +19,73 @@ def download_and_extract_gml(url, data_dir, filename=None):
         url: URL of the zip file
         data_dir: Directory to save the GML file
         filename: Optional custom filename for the GML file
+        session: Optional requests.Session to reuse connections across downloads
     
     Returns:
         Path to the extracted GML file or None if failed
     """
+    http = session if session is not None else requests
     try:
-        # Download the zip file
-        response = requests.get(url, stream=True)
-        response.raise_for_status()
-        
-        # Extract the zip content
-        with zipfile.ZipFile(io.BytesIO(response.content)) as zip_file:
-            # Find GML files in the archive
-            gml_files = [f for f in zip_file.namelist() if f.lower().endswith('.gml')]
-            
-            if not gml_files:
-                print(f"No GML file found in {url}")
-                return None
-            
-            # Extract the first GML file
-            gml_content = zip_file.read(gml_files[0])
-            
-            # Create output filename
-            if filename:
-                output_file = os.path.join(data_dir, filename)
-            else:
-                # Use original filename or create one based on URL
-                base_name = os.path.basename(gml_files[0])
-                if not base_name:
-                    base_name = f"file_{hash(url)}.gml"
-                output_file = os.path.join(data_dir, base_name)
-            
-            # Save to disk
-            with open(output_file, 'wb') as f:
-                f.write(gml_content)
-            
-            return output_file
+        # Stream the zip file straight to a temporary file next to the output
+        with http.get(url, stream=True) as response, tempfile.TemporaryFile(
+            dir=data_dir
+        ) as zip_buffer:
+            response.raise_for_status()
+            response.raw.decode_content = True
+            shutil.copyfileobj(response.raw, zip_buffer, length=CHUNK_SIZE)
+            zip_buffer.seek(0)
+            return _extract_first_gml(zip_buffer, url, data_dir, filename)
     
     except Exception as e:
         print(f"Error processing {url}: {str(e)}")
         return None
 
-def process_csv(csv_path, data_dir):
+def _extract_first_gml(zip_source, url, data_dir, filename=None):
+    """
+    Extract the first GML file of a zip archive into the data directory
+    
+    Args:
+        zip_source: Path or seekable file object of the zip archive
+        url: URL the archive was downloaded from (used for messages and fallback names)
+        data_dir: Directory to save the GML file
+        filename: Optional custom filename for the GML file
+    
+    Returns:
+        Path to the extracted GML file or None if the archive holds no GML file
+    """
+    # Extract the zip content
+    with zipfile.ZipFile(zip_source) as zip_file:
+        # Find GML files in the archive
+        gml_files = [f for f in zip_file.namelist() if f.lower().endswith('.gml')]
+
+        if not gml_files:
+            print(f"No GML file found in {url}")
+            return None
+
+        # Create output filename
+        if filename:
+            output_file = os.path.join(data_dir, filename)
+        else:
+            # Use original filename or create one based on URL
+            base_name = os.path.basename(gml_files[0])
+            if not base_name:
+                base_name = f"file_{hash(url)}.gml"
+            output_file = os.path.join(data_dir, base_name)
+
+        # Stream the first GML file to disk without loading it into memory
+        with zip_file.open(gml_files[0]) as src, open(output_file, 'wb') as dst:
+            shutil.copyfileobj(src, dst, length=CHUNK_SIZE)
+
+        return output_file
+
+def process_csv(csv_path, data_dir, max_workers=16):
     """
     Process a CSV file containing URLs in the first column
     
     Args:
         csv_path: Path to the CSV file
         data_dir: Directory to save the extracted GML files
+        max_workers: Number of concurrent downloads
     """
     # Create data directory if it doesn't exist
     os.makedirs(data_dir, exist_ok=True)
@@ -77,12 +101,23 @@ def process_csv(csv_path, data_dir):
             if row and len(row) > 0 and row[0].strip():
                 urls.append(row[0].strip())
     
-    # Process each URL
-    print(f"Processing {len(urls)} URLs...")
-    for i, url in enumerate(tqdm(urls)):
-        output_file = download_and_extract_gml(url, data_dir)
-        if output_file:
-            tqdm.write(f"[{i+1}/{len(urls)}] Extracted: {os.path.basename(output_file)}")
+    # Process the URLs concurrently, reusing pooled connections from one session
+    print(f"Processing {len(urls)} URLs with {max_workers} workers...")
+    with requests.Session() as session, ThreadPoolExecutor(
+        max_workers=max_workers
+    ) as executor:
+        # Size the connection pool so every worker can keep its socket alive
+        adapter = requests.adapters.HTTPAdapter(pool_maxsize=max_workers)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        futures = [
+            executor.submit(download_and_extract_gml, url, data_dir, session=session)
+            for url in urls
+        ]
+        for i, future in enumerate(tqdm(as_completed(futures), total=len(futures))):
+            output_file = future.result()
+            if output_file:
+                tqdm.write(f"[{i+1}/{len(urls)}] Extracted: {os.path.basename(output_file)}")
 
 if __name__ == "__main__":
     import argparse
@@ -90,8 +125,14 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Download and extract GML files from URLs in a CSV file")
     parser.add_argument("csv_file", help="Path to the CSV file containing URLs in the first column")
     parser.add_argument("--data_dir", default="data", help="Directory to save the GML files (default: 'data')")
+    parser.add_argument(
+        "--max_workers",
+        type=int,
+        default=16,
+        help="Number of concurrent downloads (default: 16)",
+    )
     
     args = parser.parse_args()
     
-    process_csv(args.csv_file, args.data_dir)
+    process_csv(args.csv_file, args.data_dir, max_workers=args.max_workers)
     print("Processing complete!")
\ No newline at end of file
@@ -4,6 +4,7 @@ Provides functionality to compute and describe the terrace borders in meters.
 """
 
 from typing import Dict, Tuple
+import numpy as np
 import pyproj
 
 from src.config import TERRACE_CORNERS
@@ -27,24 +28,15 @@ def compute_border_lengths(corners: Dict[str, Tuple[float, float]]) -> Dict[str,
     # Initialize a geodetic calculator for the WGS84 ellipsoid
     geod = pyproj.Geod(ellps="WGS84")
 
-    # Extract corner coordinates
-    nw = corners["NW"]
-    ne = corners["NE"]
-    se = corners["SE"]
-    sw = corners["SW"]
+    # Walk the border clockwise: NW -> NE -> SE -> SW -> NW.
+    order = ["NW", "NE", "SE", "SW"]
+    lats = np.array([corners[key][0] for key in order])
+    lons = np.array([corners[key][1] for key in order])
 
-    # Compute borders (note: pyproj expects coordinates as (lon, lat))
-    north_border = geod.inv(nw[1], nw[0], ne[1], ne[0])[2]
-    east_border = geod.inv(ne[1], ne[0], se[1], se[0])[2]
-    south_border = geod.inv(se[1], se[0], sw[1], sw[0])[2]
-    west_border = geod.inv(sw[1], sw[0], nw[1], nw[0])[2]
+    # Compute all borders in one call (note: pyproj expects coordinates as (lon, lat))
+    _, _, distances = geod.inv(lons, lats, np.roll(lons, -1), np.roll(lats, -1))
 
-    return {
-        "north": abs(north_border),
-        "east": abs(east_border),
-        "south": abs(south_border),
-        "west": abs(west_border),
-    }
+    return dict(zip(["north", "east", "south", "west"], np.abs(distances).tolist()))
 
 
 def describe_terrace(corners: Dict[str, Tuple[float, float]]) -> str:
@@ -12,6 +12,8 @@ result can then be exported or further processed.
 
 import os
 import fiona
+import numpy as np
+import shapely
 from shapely.geometry import shape, Polygon
 from shapely.ops import unary_union
 import trimesh
@@ -26,14 +28,12 @@ def extract_footprint_and_height(poly: Polygon, default_height=10.0):
     Given a 3D Polygon, extract the 2D footprint (projecting x,y from the exterior) and
     compute the height.
     """
-    coords = list(poly.exterior.coords)
-    if len(coords[0]) < 3:
+    if not poly.has_z:
         return poly, default_height
-    xs = [pt[0] for pt in coords]
-    ys = [pt[1] for pt in coords]
-    zs = [pt[2] for pt in coords]
-    footprint = Polygon(zip(xs, ys))
-    h = max(zs) - min(zs)
+    coords = shapely.get_coordinates(poly.exterior, include_z=True)
+    footprint = Polygon(coords[:, :2])
+    zs = coords[:, 2]
+    h = float(zs.max() - zs.min())
     if h == 0:
         h = default_height
     return footprint, h
@@ -121,17 +121,13 @@ def find_matching_roof(building_footprint, roof_features):
 
     Returns the matching roof feature tuple, or None if none intersect.
     """
-    best_roof = None
-    best_area = 0.0
-    for roof in roof_features:
-        _, _, roof_fp, _ = roof
-        inter = building_footprint.intersection(roof_fp)
-        if not inter.is_empty:
-            area = inter.area
-            if area > best_area:
-                best_area = area
-                best_roof = roof
-    return best_roof
+    if not roof_features:
+        return None
+    # Intersect against all roof footprints in one vectorized GEOS call.
+    roof_fps = np.array([roof[2] for roof in roof_features], dtype=object)
+    areas = shapely.area(shapely.intersection(building_footprint, roof_fps))
+    best = int(np.argmax(areas))
+    return roof_features[best] if areas[best] > 0.0 else None
 
 
 if __name__ == "__main__":
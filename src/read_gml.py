@@ -7,10 +7,10 @@ module computes and prints the building’s EGID and its centroid location in la
 longitude.
 
 Workflow:
-  1. Parse the CityGML file using lxml.
-  2. Find all building elements.
+  1. Stream the CityGML file using lxml's iterparse.
+  2. Visit each building element, releasing it once processed.
   3. Extract and print unique EGID values.
-  4. Select the first building element.
+  4. Select the building matching TARGET_EGID (or the first building element).
   5. Compute its centroid from the union of its surfaces and transform it to WGS84.
   6. Extract its surfaces (<gml:Polygon>), triangulate each surface, and assemble them
      into a Trimesh mesh.
@@ -22,9 +22,12 @@ Usage:
 """
 
 import os
+import warnings
+from copy import deepcopy
 from lxml import etree
+import shapely
 from shapely.geometry import Polygon
-from shapely.ops import unary_union, triangulate
+from shapely.ops import triangulate
 import trimesh
 import numpy as np
 from pyproj import Transformer
@@ -50,6 +53,35 @@ TARGET_EGID = "1010180"
 SOURCE_EPSG = "EPSG:2056"
 TARGET_EPSG = "EPSG:4326"
 
+# Precompiled XPath expressions and the streaming tag for building elements.
+BUILDING_TAG = f"{{{NSMAP['bldg']}}}Building"
+BUILDINGS_XP = etree.XPath(".//bldg:Building", namespaces=NSMAP)
+EGID_XP = etree.XPath(".//bldg:EGID/text()", namespaces=NSMAP)
+# The document root is excluded: it has no parent to delete siblings from, and may be
+# preceded by comments or processing instructions.
+_ANCESTORS_XP = etree.XPath("ancestor-or-self::*[parent::*]")
+
+# Transform from the source CRS to WGS84, created once at import time.
+_T_LV95_TO_WGS = Transformer.from_crs(SOURCE_EPSG, TARGET_EPSG, always_xy=True)
+
+# Vertex welding tolerance in source CRS units (meters). swissBUILDINGS3D coordinates
+# are given to the millimeter, so 0.1 mm only merges float noise. Coordinates are
+# quantized to 21 bits per axis for the Morton key, which covers about 209 m at this
+# tolerance; larger meshes are welded with a coarser cell and a warning.
+WELD_EPS = 1e-4
+_MORTON_BITS = 21
+# Offsets to the 13 neighbouring cells that follow a cell in lexicographic order, so
+# each pair of adjacent cells is visited once.
+_NEIGHBOUR_OFFSETS = np.array(
+    [
+        (dx, dy, dz)
+        for dx in (-1, 0, 1)
+        for dy in (-1, 0, 1)
+        for dz in (-1, 0, 1)
+        if (dx, dy, dz) > (0, 0, 0)
+    ]
+)
+
 
 def parse_citygml(file_path):
     """Parse the CityGML file and return the XML tree."""
@@ -62,18 +94,35 @@ def find_all_buildings(tree):
     Find all building elements.
     Returns a list of building elements.
     """
-    buildings = tree.xpath(".//bldg:Building", namespaces=NSMAP)
+    buildings = BUILDINGS_XP(tree)
     return buildings
 
 
+def iter_buildings(file_path):
+    """
+    Stream building elements from a CityGML file with iterparse instead of loading the
+    whole tree. Each building is cleared, together with everything parsed before it,
+    as soon as the caller moves on to the next one, so use (or deepcopy) a building
+    before advancing the iterator.
+    """
+    for _, building_elem in etree.iterparse(
+        file_path, events=("end",), tag=BUILDING_TAG
+    ):
+        yield building_elem
+        building_elem.clear()
+        for ancestor in _ANCESTORS_XP(building_elem):
+            while ancestor.getprevious() is not None:
+                del ancestor.getparent()[0]
+
+
 def extract_egid(building_elem):
     """
     Extract the EGID from a building element.
     Assumes the EGID is stored in a <bldg:EGID> element.
     """
-    egid_elem = building_elem.find(".//bldg:EGID", namespaces=NSMAP)
-    if egid_elem is not None and egid_elem.text:
-        return egid_elem.text.strip()
+    egid_texts = EGID_XP(building_elem)
+    if egid_texts and egid_texts[0]:
+        return egid_texts[0].strip()
     return None
 
 
@@ -90,40 +139,30 @@ def print_unique_egids(buildings):
     return egids
 
 
-def get_building_location(building_elem):
+def get_building_location(building_elem, polygons=None):
     """
     Compute the centroid (x,y) of a building element (by unioning all its surfaces)
     and transform that coordinate from the source CRS (assumed EPSG:2056) to WGS84.
+    Pass the output of load_building_polygons as `polygons` to reuse parsed surfaces.
     Returns (lat, lon).
     """
-    # Extract all polygon surfaces
-    polygons = building_elem.xpath(".//gml:Polygon", namespaces=NSMAP)
-    polys = []
-    for poly_elem in polygons:
-        posList_elem = poly_elem.find(".//gml:posList", namespaces=NSMAP)
-        if posList_elem is None or posList_elem.text is None:
-            continue
-        coords_str = posList_elem.text.strip()
-        coords = [float(v) for v in coords_str.split()]
-        pts = []
-        for i in range(0, len(coords), 3):
-            pts.append((coords[i], coords[i + 1], coords[i + 2]))
-        if pts:
-            # Use only x,y for footprint.
-            xy = [(pt[0], pt[1]) for pt in pts]
-            try:
-                poly = Polygon(xy)
-                if not poly.is_empty:
-                    polys.append(poly)
-            except Exception as e:
-                print("Error creating polygon:", e)
-    if not polys:
+    if polygons is None:
+        polygons = load_building_polygons(building_elem)
+    # Use only x,y for footprint.
+    rings_xy = [pts[:, :2] for pts in polygons if len(pts) >= 3]
+    if not rings_xy:
+        return None
+    # Build every footprint polygon in one GEOS call from a ragged coordinate array.
+    ring_sizes = [len(ring) for ring in rings_xy]
+    ring_ids = np.repeat(np.arange(len(rings_xy)), ring_sizes)
+    rings = shapely.linearrings(np.concatenate(rings_xy), indices=ring_ids)
+    union_poly = shapely.unary_union(shapely.polygons(rings))
+    # Empty surfaces do not contribute to the union, so only the result is checked.
+    if union_poly.is_empty:
         return None
-    union_poly = unary_union(polys)
     centroid = union_poly.centroid
     # Transform from SOURCE_EPSG to WGS84.
-    transformer = Transformer.from_crs(SOURCE_EPSG, TARGET_EPSG, always_xy=True)
-    lon, lat = transformer.transform(centroid.x, centroid.y)
+    lon, lat = _T_LV95_TO_WGS.transform(centroid.x, centroid.y)
     return lat, lon
 
 
@@ -135,112 +174,252 @@ def extract_building_surfaces(building_elem):
     return polygons
 
 
+def load_building_polygons(building_elem):
+    """
+    Walk the surfaces of a building element once and parse each into an (n, 3) array,
+    so the centroid and mesh computations can share the parsed coordinates.
+    Returns a list of (n, 3) float arrays.
+    """
+    polygons = []
+    for poly_elem in extract_building_surfaces(building_elem):
+        pts = parse_polygon(poly_elem)
+        if pts is not None:
+            polygons.append(pts)
+    return polygons
+
+
 def parse_polygon(polygon_elem):
     """
     Extract the coordinate list from a gml:Polygon element.
-    Returns a list of (x,y,z) tuples.
+    Returns an (n, 3) float array of (x,y,z) coordinates.
     """
     posList_elem = polygon_elem.find(".//gml:posList", namespaces=NSMAP)
     if posList_elem is None or posList_elem.text is None:
         return None
-    coords_str = posList_elem.text.strip()
-    coords = [float(v) for v in coords_str.split()]
-    pts = []
-    for i in range(0, len(coords), 3):
-        pts.append((coords[i], coords[i + 1], coords[i + 2]))
-    return pts
+    coords = np.fromstring(posList_elem.text, dtype=np.float64, sep=" ")
+    # Drop a trailing incomplete coordinate, if any, before reshaping.
+    return coords[: len(coords) - len(coords) % 3].reshape(-1, 3)
+
+
+def _fan_triangulate(n):
+    """
+    Return the (n - 2, 3) vertex indices of a fan triangulation of an n-gon, with every
+    triangle anchored at vertex 0.
+    """
+    return np.stack(
+        [np.zeros(n - 2, dtype=int), np.arange(1, n - 1), np.arange(2, n)], axis=1
+    )
+
+
+def _is_convex(pts_2d):
+    """
+    Check whether an open ring of 2D points is convex, i.e. all turns between
+    consecutive edges have the same orientation (collinear turns are allowed).
+    """
+    d = np.diff(pts_2d, axis=0, append=pts_2d[:1])
+    cross = d[:, 0] * np.roll(d[:, 1], -1) - d[:, 1] * np.roll(d[:, 0], -1)
+    if not np.any(cross):
+        return False
+    return bool(np.all(cross >= 0) or np.all(cross <= 0))
 
 
 def triangulate_surface(points):
     """
-    Given a list of 3D points for a polygon, project to 2D (x,y), triangulate the 2D
-    polygon, and reattach an average z-value.
-    Returns a list of triangles (each triangle is a list of three (x,y,z) tuples).
+    Given an (n, 3) array of 3D points for a polygon, project to 2D (x,y), triangulate
+    the 2D polygon, and reattach an average z-value. Convex surfaces are fan
+    triangulated directly; other surfaces fall back to shapely's triangulate.
+    Returns an (n_tri, 3, 3) array of triangles (each row is three (x,y,z) points).
     """
-    pts_2d = [(x, y) for (x, y, z) in points]
-    poly = Polygon(pts_2d)
+    points = np.asarray(points, dtype=np.float64)
+    avg_z = points[:, 2].mean()
+    ring = points[:-1] if np.array_equal(points[0], points[-1]) else points
+    if len(ring) >= 3 and _is_convex(ring[:, :2]):
+        tris = ring[_fan_triangulate(len(ring))]
+        tris[:, :, 2] = avg_z
+        return tris
+    poly = Polygon(points[:, :2])
     triangles = triangulate(poly)
-    avg_z = np.mean([pt[2] for pt in points])
-    tri_list = []
-    for tri in triangles:
-        coords = list(tri.exterior.coords)[:-1]
-        tri_list.append([(x, y, avg_z) for (x, y) in coords])
-    return tri_list
+    tris = np.full((len(triangles), 3, 3), avg_z)
+    for i, tri in enumerate(triangles):
+        tris[i, :, :2] = np.asarray(tri.exterior.coords)[:-1, :2]
+    return tris
 
 
-def build_building_mesh(building_elem):
+def _part1by2(v):
+    """
+    Spread the lower 21 bits of each uint64 value so that two zero bits separate
+    consecutive bits, ready to be interleaved into a 3D Morton code.
+    """
+    v = v & np.uint64(0x1FFFFF)
+    v = (v | (v << np.uint64(32))) & np.uint64(0x1F00000000FFFF)
+    v = (v | (v << np.uint64(16))) & np.uint64(0x1F0000FF0000FF)
+    v = (v | (v << np.uint64(8))) & np.uint64(0x100F00F00F00F00F)
+    v = (v | (v << np.uint64(4))) & np.uint64(0x10C30C30C30C30C3)
+    v = (v | (v << np.uint64(2))) & np.uint64(0x1249249249249249)
+    return v
+
+
+def _morton_keys(qi):
+    """
+    Interleave the bits of (n, 3) non-negative integer cell coordinates into 64-bit
+    Morton keys.
+    """
+    qi = qi.astype(np.uint64)
+    return (
+        _part1by2(qi[:, 0])
+        | (_part1by2(qi[:, 1]) << np.uint64(1))
+        | (_part1by2(qi[:, 2]) << np.uint64(2))
+    )
+
+
+def weld_vertices(points, eps=WELD_EPS):
+    """
+    Weld an (n, 3) array of points with a spatial hash: points are quantized to integer
+    cells of size eps (relative to the minimum corner) and each cell gets a 64-bit
+    Morton key. Points sharing a cell are merged, and so are adjacent cells whose mean
+    points are within eps of each other along every axis, so near-duplicates that
+    straddle a cell boundary still weld (merging is transitive across such cells).
+    Each welded vertex is the average of its points.
+
+    If the extent needs more than 2**21 cells of size eps per axis, the cell is widened
+    to fit the Morton key and a warning is emitted.
+    Returns (vertices, inverse) where vertices[inverse] approximates points.
+    """
+    origin = points.min(axis=0)
+    extent = float((points.max(axis=0) - origin).max())
+    n_cells_max = 2**_MORTON_BITS
+    cell = max(eps, extent / (n_cells_max - 1))
+    if cell > eps:
+        warnings.warn(
+            f"weld_vertices: a {extent:g} extent exceeds {n_cells_max} cells of "
+            f"{eps:g}; welding with a {cell:g} tolerance instead."
+        )
+    qi = np.floor((points - origin) / cell).astype(np.int64)
+    np.minimum(qi, n_cells_max - 1, out=qi)
+    cell_keys, cell_of_point = np.unique(_morton_keys(qi), return_inverse=True)
+    cell_of_point = cell_of_point.reshape(-1)
+    n_cells = len(cell_keys)
+    cell_counts = np.bincount(cell_of_point, minlength=n_cells)
+    cell_means = np.zeros((n_cells, 3))
+    np.add.at(cell_means, cell_of_point, points)
+    cell_means /= cell_counts[:, None]
+    cell_q = np.empty((n_cells, 3), dtype=np.int64)
+    cell_q[cell_of_point] = qi
+
+    # Link each occupied cell to its occupied neighbours with a close enough mean.
+    links_a, links_b = [], []
+    for offset in _NEIGHBOUR_OFFSETS:
+        neighbour_q = cell_q + offset
+        inside = np.flatnonzero(
+            np.all((neighbour_q >= 0) & (neighbour_q < n_cells_max), axis=1)
+        )
+        neighbour_keys = _morton_keys(neighbour_q[inside])
+        pos = np.minimum(np.searchsorted(cell_keys, neighbour_keys), n_cells - 1)
+        occupied = cell_keys[pos] == neighbour_keys
+        a, b = inside[occupied], pos[occupied]
+        close = np.all(np.abs(cell_means[a] - cell_means[b]) <= cell, axis=1)
+        links_a.append(a[close])
+        links_b.append(b[close])
+    links_a = np.concatenate(links_a)
+    links_b = np.concatenate(links_b)
+
+    # Label each group of linked cells with its smallest cell index, propagated along
+    # the links until no label changes.
+    labels = np.arange(n_cells)
+    while len(links_a):
+        low = np.minimum(labels[links_a], labels[links_b])
+        if np.array_equal(low, labels[links_a]) and np.array_equal(
+            low, labels[links_b]
+        ):
+            break
+        np.minimum.at(labels, links_a, low)
+        np.minimum.at(labels, links_b, low)
+        labels = labels[labels]
+
+    _, inverse, counts = np.unique(
+        labels[cell_of_point], return_inverse=True, return_counts=True
+    )
+    inverse = inverse.reshape(-1)
+    # Average the members of each group, visiting points grouped by group.
+    order = np.argsort(inverse, kind="stable")
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    vertices = np.add.reduceat(points[order], starts, axis=0) / counts[:, None]
+    return vertices, inverse
+
+
+def build_building_mesh(building_elem, polygons=None):
     """
     From a building element, extract all surface polygons, triangulate them, and
-    assemble a Trimesh mesh.
+    assemble a Trimesh mesh. Pass the output of load_building_polygons as `polygons`
+    to reuse parsed surfaces.
     """
-    polygons = extract_building_surfaces(building_elem)
+    if polygons is None:
+        polygons = load_building_polygons(building_elem)
     if not polygons:
         raise ValueError("No polygons found in building element.")
     all_triangles = []
-    for poly_elem in polygons:
-        pts = parse_polygon(poly_elem)
-        if pts is None or len(pts) < 3:
+    for pts in polygons:
+        if len(pts) < 3:
             continue
         try:
-            tris = triangulate_surface(pts)
-            all_triangles.extend(tris)
+            all_triangles.append(triangulate_surface(pts))
         except Exception as e:
             print("Triangulation error:", e)
-    vertices = []
-    faces = []
-    vertex_map = {}
-
-    def add_vertex(pt):
-        key = (round(pt[0], 6), round(pt[1], 6), round(pt[2], 6))
-        if key in vertex_map:
-            return vertex_map[key]
-        index = len(vertices)
-        vertices.append(pt)
-        vertex_map[key] = index
-        return index
-
-    for tri in all_triangles:
-        face = [add_vertex(pt) for pt in tri]
-        if len(face) == 3:
-            faces.append(face)
-    if not vertices or not faces:
-        raise ValueError("No valid triangles generated.")
-    mesh = trimesh.Trimesh(
-        vertices=np.array(vertices), faces=np.array(faces), process=True
+    tri_array = (
+        np.concatenate(all_triangles).reshape(-1, 3)
+        if all_triangles
+        else np.empty((0, 3))
     )
+    if not len(tri_array):
+        raise ValueError("No valid triangles generated.")
+    # Weld shared corners with a Morton-keyed spatial hash in one vectorized pass.
+    vertices, inverse = weld_vertices(tri_array)
+    faces = inverse.reshape(-1, 3)
+    # Vertices are already welded, so skip trimesh's processing pass and only drop the
+    # zero-area faces that welding or collinear surface points can leave behind.
+    mesh = trimesh.Trimesh(vertices=vertices, faces=faces, process=False)
+    mesh.update_faces(mesh.nondegenerate_faces())
     return mesh
 
 
 if __name__ == "__main__":
-    print("Parsing CityGML file...")
-    tree = parse_citygml(FILE_PATH)
-    buildings = tree.xpath(".//bldg:Building", namespaces=NSMAP)
-    if not buildings:
-        print("No building elements found.")
-        exit(1)
-    print(f"Found {len(buildings)} building elements.")
+    print("Streaming CityGML file...")
+    n_buildings = 0
     unique_egids = set()
-    for b in buildings:
+    first_building = target_building = None
+    for b in iter_buildings(FILE_PATH):
+        n_buildings += 1
         egid = extract_egid(b)
         if egid:
             unique_egids.add(egid)
+        # Keep copies of the buildings we need, since streamed elements are cleared.
+        if first_building is None:
+            first_building = deepcopy(b)
+        if target_building is None and egid == TARGET_EGID:
+            target_building = deepcopy(b)
+    if not n_buildings:
+        print("No building elements found.")
+        exit(1)
+    print(f"Found {n_buildings} building elements.")
     print("Unique EGIDs in file:")
     for egid in sorted(unique_egids):
         print("  ", egid)
 
-    # For this example, use the first building element.
-    building_elem = buildings[0]
+    # Use the target building if present, otherwise the first building element.
+    building_elem = target_building if target_building is not None else first_building
     egid = extract_egid(building_elem)
     print(f"Using building with EGID: {egid if egid else 'None'}")
 
-    location = get_building_location(building_elem)
+    # Parse the building's surfaces once for both the centroid and the mesh.
+    polygons = load_building_polygons(building_elem)
+    location = get_building_location(building_elem, polygons)
     if location:
         print(f"Building centroid (lat, lon): {location}")
     else:
         print("Could not compute building location.")
 
     try:
-        building_mesh = build_building_mesh(building_elem)
+        building_mesh = build_building_mesh(building_elem, polygons)
     except Exception as e:
         print("Failed to build building mesh:", e)
         exit(1)
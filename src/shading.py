@@ -11,8 +11,9 @@ This module:
          with its northeast ground–corner flush with the terrace’s northwest corner and
          rotated to match the terrace edge.
   3. Applies small vertical offsets (≈1 cm) between shapes to avoid z-fighting.
-  4. Computes the shadow–adjusted last sunlit time.
-  5. Visualizes the scene with colored elements and a sun ray.
+  4. Computes the shadow–adjusted last sunlit time and, at that time, which points of
+     a sample grid over the terrace are sunlit.
+  5. Visualizes the scene with colored elements, a sun ray and the terrace samples.
 
 Colors:
   - Floor: Gray ([128, 128, 128, 255])
@@ -20,20 +21,28 @@ Colors:
   - Building: Blue ([0, 0, 255, 255])
   - Terrace center marker: White ([255, 255, 255, 255])
   - Sun ray: Yellow ([255, 255, 0, 255])
+  - Terrace samples: Yellow when sunlit, black when shaded
 
-Note: This module uses functions from src.config and src.solar.
+Note: This module uses functions from src.config, src.solar and src.shading_numba.
 """
 
+from bisect import bisect_left
+
 import numpy as np
 import pandas as pd
 import trimesh
 import pyproj
+import shapely
 from datetime import datetime
 from shapely.geometry import Polygon, box
 from shapely.affinity import rotate, translate
 
 from src.config import DATE_FORMAT, TERRACE_CORNERS
-from src.solar import get_time_series, get_solar_positions
+from src.shading_numba import any_hit
+from src.solar import get_sun_df
+
+# Building a Transformer initializes a PROJ context, so create it once and reuse it.
+_T_WGS_TO_UTM = pyproj.Transformer.from_crs("EPSG:4326", "EPSG:32632", always_xy=True)
 
 
 def set_vertex_color(mesh: trimesh.Trimesh, color: list[int]) -> None:
@@ -52,21 +61,35 @@ def latlon_to_utm(lon: float, lat: float) -> tuple[float, float]:
     Convert WGS84 (lon, lat) to UTM (meters). Here we use EPSG:32632 (appropriate for
     Geneva).
     """
-    transformer = pyproj.Transformer.from_crs("EPSG:4326", "EPSG:32632", always_xy=True)
-    x, y = transformer.transform(lon, lat)
-    return x, y
+    return _T_WGS_TO_UTM.transform(lon, lat)
+
+
+def corners_to_utm(
+    corners: dict[str, tuple[float, float]], order: list[str] | None = None
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Convert (lat, lon) corners to UTM in a single vectorized transform call.
+
+    Args:
+        corners: A dictionary mapping corner labels to (latitude, longitude) tuples.
+        order: Optional list of corner labels to convert, in order. Defaults to all
+               corners in dictionary order.
+
+    Returns:
+        A tuple (xs, ys) of UTM easting and northing arrays.
+    """
+    keys = list(corners) if order is None else order
+    lats = np.array([corners[key][0] for key in keys])
+    lons = np.array([corners[key][1] for key in keys])
+    return _T_WGS_TO_UTM.transform(lons, lats)
 
 
 def get_terrace_center(corners: dict[str, tuple[float, float]]) -> np.ndarray:
     """
     Compute the terrace center (ground-level) in UTM coordinates.
     """
-    xs, ys = [], []
-    for corner in corners.values():
-        x, y = latlon_to_utm(corner[1], corner[0])
-        xs.append(x)
-        ys.append(y)
-    return np.array([np.mean(xs), np.mean(ys), 0.0])
+    xs, ys = corners_to_utm(corners)
+    return np.array([xs.mean(), ys.mean(), 0.0])
 
 
 def create_terrace_polygon(corners: dict[str, tuple[float, float]]) -> Polygon:
@@ -74,13 +97,8 @@ def create_terrace_polygon(corners: dict[str, tuple[float, float]]) -> Polygon:
     Create a 2D polygon for the terrace footprint from the four corners.
     The order is assumed to be: NW, NE, SE, SW.
     """
-    order = ["NW", "NE", "SE", "SW"]
-    points = []
-    for key in order:
-        lat, lon = corners[key]
-        x, y = latlon_to_utm(lon, lat)
-        points.append((x, y))
-    return Polygon(points)
+    xs, ys = corners_to_utm(corners, ["NW", "NE", "SE", "SW"])
+    return Polygon(np.column_stack([xs, ys]))
 
 
 def create_terrace_extrusion(
@@ -163,8 +181,8 @@ def create_building_extrusion(
     NE) and translated so that its NE corner coincides with the terrace's NW point.
     """
     # Get terrace NW and NE points in UTM.
-    p_NW = np.array(latlon_to_utm(corners["NW"][1], corners["NW"][0]))  # 2D point
-    p_NE = np.array(latlon_to_utm(corners["NE"][1], corners["NE"][0]))  # 2D point
+    xs, ys = corners_to_utm(corners, ["NW", "NE"])
+    p_NW, p_NE = np.column_stack([xs, ys])  # 2D points
 
     # Compute the angle (in radians) of the terrace top border (from NW to NE).
     angle = np.arctan2(p_NE[1] - p_NW[1], p_NE[0] - p_NW[0])
@@ -191,35 +209,81 @@ def create_building_extrusion(
     return building_mesh
 
 
-def sun_direction_vector(azimuth: float, elevation: float) -> np.ndarray:
+def sun_direction_vector(
+    azimuth: float | np.ndarray, elevation: float | np.ndarray
+) -> np.ndarray:
     """
-    Compute the sun direction unit vector from the given azimuth and elevation (in
+    Compute sun direction unit vectors from the given azimuths and elevations (in
     degrees). Uses the convention: x = east, y = north, z = up.
+
+    Scalars yield a (3,) vector and arrays of shape (N,) yield an (N, 3) array. The
+    components are unit length by construction, so no normalization is needed.
     """
-    az_rad = np.radians(azimuth)
-    el_rad = np.radians(elevation)
+    az_rad = np.radians(np.asarray(azimuth, dtype=np.float64))
+    el_rad = np.radians(np.asarray(elevation, dtype=np.float64))
     cos_el = np.cos(el_rad)
-    x = cos_el * np.sin(az_rad)
-    y = cos_el * np.cos(az_rad)
-    z = np.sin(el_rad)
-    vec = np.array([x, y, z])
-    norm = np.linalg.norm(vec)
-    return vec if norm == 0 else vec / norm
+    return np.stack(
+        [cos_el * np.sin(az_rad), cos_el * np.cos(az_rad), np.sin(el_rad)], axis=-1
+    )
+
+
+def get_terrace_sample_points(
+    terrace_polygon: Polygon, spacing: float = 0.5
+) -> np.ndarray:
+    """
+    Sample the terrace footprint on a regular grid (ground-level, UTM coordinates).
+
+    Args:
+        terrace_polygon: The 2D terrace footprint.
+        spacing: Grid spacing in meters.
+
+    Returns:
+        An (N, 3) array of the grid points that fall inside the terrace footprint.
+    """
+    minx, miny, maxx, maxy = terrace_polygon.bounds
+    gx, gy = np.meshgrid(
+        np.arange(minx + spacing / 2, maxx, spacing),
+        np.arange(miny + spacing / 2, maxy, spacing),
+    )
+    gx, gy = gx.ravel(), gy.ravel()
+    inside = shapely.contains_xy(terrace_polygon, gx, gy)
+    return np.column_stack([gx[inside], gy[inside], np.zeros(inside.sum())])
 
 
 def is_terrace_sunlit(
-    terrace_center: np.ndarray, sun_dir: np.ndarray, building: trimesh.Trimesh
-) -> bool:
+    points: np.ndarray, sun_dir: np.ndarray, building: trimesh.Trimesh | np.ndarray
+) -> bool | np.ndarray:
     """
-    Cast a ray from a point slightly above the terrace center in the sun direction.
-    Return True if the ray does not intersect the building.
+    Cast rays from points slightly above the terrace in the sun direction, using the
+    compiled ray/triangle kernel from src.shading_numba.
+
+    Args:
+        points: A (3,) terrace point (e.g. the center) or an (N, 3) array of samples.
+        sun_dir: The (3,) sun direction unit vector, or an (N, 3) array of directions
+                 (e.g. one per time from sun_direction_vector).
+        building: The building mesh that may cast a shadow, or its precomputed (M, 3, 3)
+                  triangle array (see `building.triangles`) to skip the lookup.
+
+    Returns:
+        For a single point and direction, True if its ray does not intersect the
+        building. Otherwise, a boolean mask of shape (N,) that is True for every sunlit
+        ray, with points and directions paired up by broadcasting.
     """
-    origin = terrace_center.copy()
-    origin[2] += 1.0  # elevate by 1 m to simulate sensor height
-    locations = building.ray.intersects_location(
-        ray_origins=[origin], ray_directions=[sun_dir]
-    )[0]
-    return len(locations) == 0
+    points = np.asarray(points, dtype=np.float64)
+    sun_dir = np.asarray(sun_dir, dtype=np.float64)
+    origins, directions = np.broadcast_arrays(
+        np.atleast_2d(points) + np.array([0.0, 0.0, 1.0]),  # 1 m sensor height
+        np.atleast_2d(sun_dir),
+    )
+    triangles = (
+        building.triangles if isinstance(building, trimesh.Trimesh) else building
+    )
+    hits = any_hit(
+        np.ascontiguousarray(origins), np.ascontiguousarray(directions), triangles
+    )
+    if points.ndim == 1 and sun_dir.ndim == 1:
+        return bool(not hits[0])
+    return ~hits
 
 
 def get_shadow_adjusted_last_sunray_time(
@@ -230,19 +294,35 @@ def get_shadow_adjusted_last_sunray_time(
     evening_threshold: float = -0.833,
 ) -> pd.Timestamp | None:
     """
-    Iterate backward over times (where sun elevation is above the threshold) and return
-    the last time at which the terrace is sunlit (i.e. the ray from the terrace center
-    does not hit the building).
+    Return the last time (where sun elevation is above the threshold) at which the
+    terrace is sunlit (i.e. the ray from the terrace center does not hit the building).
+
+    After the sun's peak the terrace is assumed to go from sunlit to shaded at most
+    once, so the afternoon transition is found by bisection with ~log2(N) ray casts.
+    If the terrace is already shaded at the peak, all times are cast in one batch.
     """
-    valid = solar_positions[solar_positions["elevation"] > evening_threshold]
-    if valid.empty:
+    # Work on the raw columns rather than a boolean-indexed copy of the DataFrame.
+    all_elevations = solar_positions["elevation"].to_numpy(copy=False)
+    valid = all_elevations > evening_threshold
+    if not valid.any():
         return None
-    for t in valid.index[::-1]:
-        pos = valid.loc[t]
-        sun_dir = sun_direction_vector(pos["azimuth"], pos["elevation"])
-        if is_terrace_sunlit(terrace_center, sun_dir, building):
-            return t
-    return None
+    valid_times = solar_positions.index[valid]
+    azimuths = solar_positions["azimuth"].to_numpy(copy=False)[valid]
+    elevations = all_elevations[valid]
+    triangles = building.triangles
+
+    def is_shaded(i: int) -> bool:
+        sun_dir = sun_direction_vector(azimuths[i], elevations[i])
+        return not is_terrace_sunlit(terrace_center, sun_dir, triangles)
+
+    peak = int(elevations.argmax())
+    first_shaded = bisect_left(range(len(elevations)), True, lo=peak, key=is_shaded)
+    if first_shaded > peak:
+        return valid_times[first_shaded - 1]
+
+    sun_dirs = sun_direction_vector(azimuths, elevations)
+    sunlit = np.flatnonzero(is_terrace_sunlit(terrace_center, sun_dirs, triangles))
+    return valid_times[sunlit[-1]] if len(sunlit) else None
 
 
 def visualize_scene(
@@ -253,10 +333,13 @@ def visualize_scene(
     sun_dir: np.ndarray | None = None,
     ray_length: float = 50.0,
     viewer: str = "gl",
+    sample_points: np.ndarray | None = None,
+    sample_sunlit: np.ndarray | None = None,
 ) -> None:
     """
     Create a scene with the floor, the extruded terrace, the building, a marker at the
-    terrace center, and optionally a sun ray.
+    terrace center, optionally a sun ray, and optionally the terrace sample points
+    colored by whether they are sunlit (yellow) or shaded (black).
 
     Shapes are separated by a small vertical offset to avoid collisions. Lighting is
     disabled to show flat colors.
@@ -284,13 +367,20 @@ def visualize_scene(
         ray_path.colors = np.tile([255, 255, 0, 255], (len(ray_path.entities), 1))
         scene.add_geometry(ray_path)
 
+    # If terrace samples are provided, show them just above the terrace top.
+    if sample_points is not None and sample_sunlit is not None:
+        colors = np.where(
+            sample_sunlit[:, None], [255, 255, 0, 255], [0, 0, 0, 255]
+        ).astype(np.uint8)
+        cloud = trimesh.PointCloud(sample_points + [0, 0, 1.02], colors=colors)
+        scene.add_geometry(cloud)
+
     scene.show(lighting=False, viewer=viewer)
 
 
 def main(viewer: str = "gl") -> None:
     today = datetime.now().strftime(DATE_FORMAT)
-    times = get_time_series(today, freq="30s")
-    solar_pos = get_solar_positions(times)
+    times, solar_pos = get_sun_df(today, freq="30s")
 
     terrace_center = get_terrace_center(TERRACE_CORNERS)
 
@@ -305,49 +395,35 @@ def main(viewer: str = "gl") -> None:
     # Create the floor by enlarging the terrace bounding box and extruding to 0.1 m.
     floor = create_floor(terrace_poly, margin=10.0, thickness=0.1)
 
+    # Look up the triangle array once and share it across all ray queries.
+    triangles = building.triangles
+
     last_sunray_time = get_shadow_adjusted_last_sunray_time(
         times, solar_pos, terrace_center, building
     )
     print("Shadow-adjusted last sunlit time:", last_sunray_time)
 
     sun_dir = None
+    sample_points = get_terrace_sample_points(terrace_poly, spacing=0.5)
+    sample_sunlit = None
     if last_sunray_time is not None:
         pos = solar_pos.loc[last_sunray_time]
         sun_dir = sun_direction_vector(pos["azimuth"], pos["elevation"])
+        sample_sunlit = is_terrace_sunlit(sample_points, sun_dir, triangles)
+        print(f"Sunlit terrace fraction at that time: {sample_sunlit.mean():.0%}")
 
     visualize_scene(
-        terrace_center, building, terrace_mesh, floor, sun_dir, ray_length=50.0, viewer=viewer
+        terrace_center,
+        building,
+        terrace_mesh,
+        floor,
+        sun_dir,
+        ray_length=50.0,
+        viewer=viewer,
+        sample_points=sample_points,
+        sample_sunlit=sample_sunlit,
     )
 
 
 if __name__ == "__main__":
-    today = datetime.now().strftime(DATE_FORMAT)
-    times = get_time_series(today, freq="30s")
-    solar_pos = get_solar_positions(times)
-
-    terrace_center = get_terrace_center(TERRACE_CORNERS)
-
-    # Create the building footprint in 2D and extrude it.
-    building = create_building_extrusion(
-        TERRACE_CORNERS, lengthvi=81.0, width=15.0, height=18.0
-    )
-
-    # Create the terrace from its 2D footprint and extrude it to 1 m.
-    terrace_mesh, terrace_poly = create_terrace_extrusion(TERRACE_CORNERS, height=1.0)
-
-    # Create the floor by enlarging the terrace bounding box and extruding to 0.1 m.
-    floor = create_floor(terrace_poly, margin=10.0, thickness=0.1)
-
-    last_sunray_time = get_shadow_adjusted_last_sunray_time(
-        times, solar_pos, terrace_center, building
-    )
-    print("Shadow-adjusted last sunlit time:", last_sunray_time)
-
-    sun_dir = None
-    if last_sunray_time is not None:
-        pos = solar_pos.loc[last_sunray_time]
-        sun_dir = sun_direction_vector(pos["azimuth"], pos["elevation"])
-
-    visualize_scene(
-        terrace_center, building, terrace_mesh, floor, sun_dir, ray_length=50.0
-    )
\ No newline at end of file
+    main()
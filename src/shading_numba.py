@@ -0,0 +1,87 @@
+"""
+Numba kernels for shading analysis of the Arbalete Sunlight Analysis project.
+
+The kernels operate on raw NumPy arrays so that many terrace sample points can be tested
+against a building mesh in one compiled, multi-threaded pass:
+  - origins: (N, 3) ray origins (e.g. a grid of points over the terrace).
+  - directions: (N, 3) ray directions (e.g. the sun direction repeated per origin).
+  - tri_verts: (M, 3, 3) triangle vertices, as given by `trimesh.Trimesh.triangles`.
+
+Functions:
+    - any_hit(origins: np.ndarray, directions: np.ndarray, tri_verts: np.ndarray)
+      -> np.ndarray
+"""
+
+import numpy as np
+from numba import njit, prange
+
+# Determinant / distance tolerance for the Möller–Trumbore test.
+EPSILON = 1e-9
+
+
+@njit(cache=True, fastmath=True)
+def _ray_hits_triangle(ox, oy, oz, dx, dy, dz, tri):
+    """
+    Möller–Trumbore ray/triangle intersection. Returns True if the ray starting at
+    (ox, oy, oz) with direction (dx, dy, dz) hits the triangle in front of its origin.
+    """
+    e1x = tri[1, 0] - tri[0, 0]
+    e1y = tri[1, 1] - tri[0, 1]
+    e1z = tri[1, 2] - tri[0, 2]
+    e2x = tri[2, 0] - tri[0, 0]
+    e2y = tri[2, 1] - tri[0, 1]
+    e2z = tri[2, 2] - tri[0, 2]
+
+    # p = d x e2
+    px = dy * e2z - dz * e2y
+    py = dz * e2x - dx * e2z
+    pz = dx * e2y - dy * e2x
+    det = e1x * px + e1y * py + e1z * pz
+    if abs(det) < EPSILON:
+        return False  # Ray parallel to the triangle plane.
+    inv_det = 1.0 / det
+
+    tx = ox - tri[0, 0]
+    ty = oy - tri[0, 1]
+    tz = oz - tri[0, 2]
+    u = (tx * px + ty * py + tz * pz) * inv_det
+    if u < 0.0 or u > 1.0:
+        return False
+
+    # q = t x e1
+    qx = ty * e1z - tz * e1y
+    qy = tz * e1x - tx * e1z
+    qz = tx * e1y - ty * e1x
+    v = (dx * qx + dy * qy + dz * qz) * inv_det
+    if v < 0.0 or u + v > 1.0:
+        return False
+
+    t = (e2x * qx + e2y * qy + e2z * qz) * inv_det
+    return t > EPSILON
+
+
+@njit(parallel=True, fastmath=True, cache=True)
+def any_hit(origins, directions, tri_verts):
+    """
+    Test N rays against M triangles, in parallel over rays and stopping at the first
+    hit of each ray.
+
+    Args:
+        origins: (N, 3) float64 array of ray origins.
+        directions: (N, 3) float64 array of ray directions.
+        tri_verts: (M, 3, 3) float64 array of triangle vertices.
+
+    Returns:
+        A boolean array of shape (N,) that is True where the ray hits any triangle.
+    """
+    n_rays = origins.shape[0]
+    n_tris = tri_verts.shape[0]
+    hits = np.zeros(n_rays, dtype=np.bool_)
+    for i in prange(n_rays):
+        ox, oy, oz = origins[i, 0], origins[i, 1], origins[i, 2]
+        dx, dy, dz = directions[i, 0], directions[i, 1], directions[i, 2]
+        for j in range(n_tris):
+            if _ray_hits_triangle(ox, oy, oz, dx, dy, dz, tri_verts[j]):
+                hits[i] = True
+                break
+    return hits
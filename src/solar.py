@@ -5,18 +5,52 @@ pvlib to compute the sun’s position based on the configured location.
 Functions:
     - get_time_series(date_str: str, freq: str = '30s') -> pd.DatetimeIndex
     - get_solar_positions(times: pd.DatetimeIndex, latitude: float = LATITUDE,
-      longitude: float = LONGITUDE, altitude: float = ALTITUDE) -> pd.DataFrame
-    - get_sunlit_times(solar_positions: pd.DataFrame,
+      longitude: float = LONGITUDE, altitude: float = ALTITUDE,
+      method: str = SOLAR_METHOD, columns: Sequence[str] | None = None)
+      -> pd.DataFrame
+    - get_solar_positions_fast(times: pd.DatetimeIndex, latitude: float = LATITUDE,
+      longitude: float = LONGITUDE) -> pd.DataFrame
+    - warm_up_solar_positions(method: str = SOLAR_METHOD) -> None
+    - get_sunlit_times(solar_positions: pd.DataFrame
+      | tuple[pd.DatetimeIndex, np.ndarray],
+      morning_threshold: float = -0.9, evening_threshold: float = -0.833,
+      as_pandas: bool = True)
+      -> tuple[pd.Timestamp | np.datetime64 | None, pd.Timestamp | np.datetime64 | None]
+    - get_sunlit_times_zenith(solar_positions: pd.DataFrame)
+      -> tuple[pd.Timestamp | None, pd.Timestamp | None]
+    - get_sunlit_times_windowed(date_str: str, latitude: float = LATITUDE,
+      longitude: float = LONGITUDE, altitude: float = ALTITUDE,
+      morning_threshold: float = -0.9, evening_threshold: float = -0.833,
+      half_window: pd.Timedelta = pd.Timedelta(hours=8))
+      -> tuple[pd.Timestamp | None, pd.Timestamp | None]
+    - compute_sunlit_times(date_str: str, latitude: float = LATITUDE,
+      longitude: float = LONGITUDE, altitude: float = ALTITUDE,
       morning_threshold: float = -0.9, evening_threshold: float = -0.833)
       -> tuple[pd.Timestamp | None, pd.Timestamp | None]
+    - find_ray_crossing(date_str: str, threshold: float, side: str,
+      latitude: float = LATITUDE, longitude: float = LONGITUDE,
+      altitude: float = ALTITUDE) -> pd.Timestamp | None
+    - get_corner_elevations(times: pd.DatetimeIndex,
+      corners: dict[str, tuple[float, float]] = TERRACE_CORNERS,
+      altitude: float = ALTITUDE) -> dict[str, tuple[pd.DatetimeIndex, np.ndarray]]
+    - get_sun_df(date_str: str, freq: str = '30s')
+      -> tuple[pd.DatetimeIndex, pd.DataFrame]
+    - get_cached_elevation(date_str: str, latitude: float = LATITUDE,
+      longitude: float = LONGITUDE, altitude: float = ALTITUDE, freq: str = '30s')
+      -> pd.DataFrame
 """
 
 from __future__ import annotations
+import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Tuple
+from functools import lru_cache
+from typing import Callable, Dict, Sequence, Tuple
 
+import numpy as np
 import pandas as pd
 import pvlib
+from scipy.optimize import brentq
 
 from src.config import (
     LATITUDE,
@@ -25,12 +59,48 @@ from src.config import (
     DATE_FORMAT,
     ALTITUDE,
     TERRACE_CORNERS,
+    SOLAR_CACHE_DIR,
 )
 
+# pvlib SPA implementation: the numba-compiled solver when numba is installed, otherwise
+# the NumPy one (identical output columns).
+try:
+    import numba  # noqa: F401
+
+    SOLAR_METHOD = "nrel_numba"
+except ImportError:
+    SOLAR_METHOD = "nrel_numpy"
+
+# Default get_sunlit_times thresholds as zenith angles in degrees, converted once for
+# get_sunlit_times_zenith.
+ZENITH_MORNING_THRESHOLD = 90.0 - (-0.9)
+ZENITH_EVENING_THRESHOLD = 90.0 - (-0.833)
+
+# Spacing of the coarse scan that brackets each threshold crossing in
+# find_ray_crossing.
+CROSSING_SCAN_STEP = pd.Timedelta(minutes=10)
+
+# A sunlit time as returned by get_sunlit_times (see its as_pandas argument).
+SunlitTime = pd.Timestamp | np.datetime64 | None
+
+# Optional ahead-of-time compiled elevation kernel (build with
+# `python setup.py build_ext --inplace`); get_solar_positions_fast falls back to pvlib.
+try:
+    from src._solar_cy import elevations as _cy_elevations
+except ImportError:
+    _cy_elevations = None
 
+# Version of the elevations stored on disk by get_cached_elevation. Bump it whenever a
+# change to this module alters them; joblib only hashes the cached function's own
+# source.
+CACHE_VERSION = 1
+
+
+@lru_cache(maxsize=32)
 def get_time_series(date_str: str, freq: str = "30s") -> pd.DatetimeIndex:
     """
-    Generate a time series for a given date at the specified frequency.
+    Generate a time series for a given date at the specified frequency. The index is
+    memoized per (date_str, freq); DatetimeIndex is immutable, so sharing is safe.
 
     Args:
         - date_str: A string representing the date (format defined in config).
@@ -39,9 +109,11 @@ def get_time_series(date_str: str, freq: str = "30s") -> pd.DatetimeIndex:
     Returns:
         A pandas DatetimeIndex covering the entire day in the configured timezone.
     """
-    start = f"{date_str} 00:00:00"
-    end = f"{date_str} 23:59:59"
-    return pd.date_range(start=start, end=end, freq=freq, tz=TIMEZONE)
+    day = pd.Timestamp(date_str)
+    start = day.tz_localize(TIMEZONE)
+    # Local midnight to midnight, so DST-change days get 23 h or 25 h of samples.
+    end = (day + pd.Timedelta(days=1)).tz_localize(TIMEZONE)
+    return pd.date_range(start=start, end=end, freq=freq, inclusive="left")
 
 
 def get_solar_positions(
@@ -49,38 +121,236 @@ def get_solar_positions(
     latitude: float = LATITUDE,
     longitude: float = LONGITUDE,
     altitude: float = ALTITUDE,
+    method: str = SOLAR_METHOD,
+    columns: Sequence[str] | None = None,
 ) -> pd.DataFrame:
     """
-    Compute solar positions for a series of times using pvlib.
+    Compute solar positions for a series of times using pvlib's NREL SPA implementation
+    (numba-compiled when available, see SOLAR_METHOD).
 
     Args:
         - times: A pandas DatetimeIndex representing time intervals.
         - latitude: Latitude of the location.
         - longitude: Longitude of the location.
         - altitude: Altitude of the location in meters.
+        - method: pvlib solar position method, e.g. 'nrel_numba' or 'nrel_numpy'. Note
+          that pvlib reloads (and for numba, recompiles) its SPA module whenever the
+          process switches between these two.
+        - columns: If given, only these columns (e.g. ('elevation',)) are returned.
 
     Returns:
         A DataFrame with solar position data (including 'elevation' and 'azimuth').
     """
-    return pvlib.solarposition.get_solarposition(
-        times, latitude, longitude, altitude=altitude, method="nrel_numpy"
+    solar_positions = pvlib.solarposition.get_solarposition(
+        times, latitude, longitude, altitude=altitude, method=method
+    )
+    if columns is not None:
+        solar_positions = solar_positions[list(columns)]
+    return solar_positions
+
+
+def _get_elevation_array(
+    times: pd.DatetimeIndex,
+    latitude: float = LATITUDE,
+    longitude: float = LONGITUDE,
+    altitude: float = ALTITUDE,
+) -> Tuple[pd.DatetimeIndex, np.ndarray]:
+    """
+    Compute only the elevation series, as the (index, float32 array) pair accepted by
+    get_sunlit_times. float32 is ample for threshold crossings and halves the bytes
+    scanned.
+    """
+    solar_positions = get_solar_positions(times, latitude, longitude, altitude)
+    elevation = solar_positions["elevation"].to_numpy(dtype=np.float32)
+    return solar_positions.index, elevation
+
+
+def get_solar_positions_fast(
+    times: pd.DatetimeIndex,
+    latitude: float = LATITUDE,
+    longitude: float = LONGITUDE,
+) -> pd.DataFrame:
+    """
+    Compute the solar elevation with the compiled Cython kernel (src/_solar_cy.pyx, an
+    analytical model within ~0.01 degrees of the SPA) when it is built, otherwise with
+    get_solar_positions.
+
+    Args:
+        - times: A pandas DatetimeIndex representing time intervals.
+        - latitude: Latitude of the location.
+        - longitude: Longitude of the location.
+
+    Returns:
+        A DataFrame with an 'elevation' column indexed by time.
+    """
+    if _cy_elevations is None:
+        return get_solar_positions(
+            times, latitude, longitude, columns=("elevation",)
+        )
+    elevation = _cy_elevations(_to_unixtime(times), latitude, longitude)
+    return pd.DataFrame({"elevation": elevation}, index=times)
+
+
+def warm_up_solar_positions(method: str = SOLAR_METHOD) -> None:
+    """
+    Run the solar position solver once on a 2-point time index so that numba's
+    multi-second JIT compilation happens now rather than on the first real call.
+
+    Args:
+        - method: pvlib solar position method to warm up.
+    """
+    times = pd.date_range("2000-01-01", periods=2, freq="30s", tz=TIMEZONE)
+    get_solar_positions(times, method=method)
+
+
+@lru_cache(maxsize=16)
+def get_sun_df(
+    date_str: str, freq: str = "30s"
+) -> Tuple[pd.DatetimeIndex, pd.DataFrame]:
+    """
+    Build the time series for a date and compute the solar positions at the configured
+    location, memoizing the result per (date_str, freq).
+
+    Args:
+        - date_str: A string representing the date (format defined in config).
+        - freq: Frequency string (default '30s') for the time intervals.
+
+    Returns:
+        A tuple (times, solar_positions). The DataFrame is shared between callers and
+        must be treated as read-only.
+    """
+    times = get_time_series(date_str, freq=freq)
+    return times, get_solar_positions(times)
+
+
+def _compute_elevation(
+    date_str: str, latitude: float, longitude: float, altitude: float, freq: str
+) -> np.ndarray:
+    """
+    Compute the elevation series for a day as float32, the value stored on disk.
+    """
+    times = get_time_series(date_str, freq=freq)
+    _, elevation = _get_elevation_array(times, latitude, longitude, altitude)
+    return elevation
+
+
+@lru_cache(maxsize=1)
+def _get_disk_cached_elevation() -> Callable[..., np.ndarray]:
+    """
+    Wrap _compute_elevation in a joblib disk cache on first use, so that importing this
+    module creates no cache directory. The directory is tagged with everything else the
+    stored elevations depend on: CACHE_VERSION, the pvlib version, the SPA method and
+    the timezone. Without joblib only the in-process lru_cache applies.
+    """
+    try:
+        from joblib import Memory
+    except ImportError:
+        return _compute_elevation
+    tag = "-".join(
+        [f"v{CACHE_VERSION}", f"pvlib{pvlib.__version__}", SOLAR_METHOD, TIMEZONE]
+    ).replace("/", "_")
+    memory = Memory(location=os.path.join(SOLAR_CACHE_DIR, tag), verbose=0)
+    return memory.cache(_compute_elevation)
+
+
+@lru_cache(maxsize=64)
+def get_cached_elevation(
+    date_str: str,
+    latitude: float = LATITUDE,
+    longitude: float = LONGITUDE,
+    altitude: float = ALTITUDE,
+    freq: str = "30s",
+) -> pd.DataFrame:
+    """
+    Return the solar elevation series for a day, cached in process and on disk (under
+    SOLAR_CACHE_DIR) by (date_str, latitude, longitude, altitude, freq). Coordinates are
+    rounded to 6 decimals and altitude to 0.1 m to form the key.
+
+    Args:
+        - date_str: A string representing the date (format defined in config).
+        - latitude: Latitude of the location.
+        - longitude: Longitude of the location.
+        - altitude: Altitude of the location in meters.
+        - freq: Frequency string (default '30s') for the time intervals.
+
+    Returns:
+        A DataFrame with a float32 'elevation' column indexed by time, suitable for
+        get_sunlit_times. It is shared between callers and must be treated as
+        read-only.
+    """
+    elevation = _get_disk_cached_elevation()(
+        date_str, round(latitude, 6), round(longitude, 6), round(altitude, 1), freq
     )
+    return pd.DataFrame(
+        {"elevation": elevation}, index=get_time_series(date_str, freq=freq)
+    )
+
+
+def _sunlit_positions(
+    values: np.ndarray,
+    morning_threshold: float,
+    evening_threshold: float,
+    sign: int = 1,
+) -> Tuple[int | None, int | None]:
+    """
+    Find the positions of the first and last sunlit samples of a single day, where a
+    sample is sunlit when sign * value > sign * threshold: sign=1 for an elevation
+    series, sign=-1 for a zenith series. A day that starts or ends sunlit returns its
+    first or last position; (None, None) means it is never sunlit.
+    """
+    if len(values) == 0:
+        return None, None
+    signed = values if sign > 0 else -values
+    # Compare in the array's own precision so float32 input is searched without an
+    # upcast copy.
+    morning_threshold = signed.dtype.type(sign * morning_threshold)
+    evening_threshold = signed.dtype.type(sign * evening_threshold)
+
+    # The signed series rises to its daily maximum and falls afterwards, and stays below
+    # the thresholds outside daylight, so each crossing is a binary search on one side
+    # of the peak.
+    peak = int(signed.argmax())
+
+    # First sunlit position (morning threshold). At high latitudes the day can start
+    # with the sun already up, so that case is checked before the search.
+    first_pos = None
+    if signed[0] > morning_threshold:
+        first_pos = 0
+    elif signed[peak] > morning_threshold:
+        first_pos = int(
+            np.searchsorted(signed[: peak + 1], morning_threshold, side="right")
+        )
+
+    # Last sunlit position (evening threshold), likewise for a day that ends with the
+    # sun still up.
+    last_pos = None
+    if signed[-1] > evening_threshold:
+        last_pos = len(signed) - 1
+    elif signed[peak] > evening_threshold:
+        n_above = np.searchsorted(-signed[peak:], -evening_threshold, side="left")
+        last_pos = peak + int(n_above) - 1
+    return first_pos, last_pos
 
 
 def get_sunlit_times(
-    solar_positions: pd.DataFrame,
+    solar_positions: pd.DataFrame | Tuple[pd.DatetimeIndex, np.ndarray],
     morning_threshold: float = -0.9,
     evening_threshold: float = -0.833,
-) -> Tuple[pd.Timestamp | None, pd.Timestamp | None]:
+    as_pandas: bool = True,
+) -> Tuple[SunlitTime, SunlitTime]:
     """
     Determine the first and last sunlit times for the day, considering atmospheric
-    refraction.
+    refraction. Assumes the elevation series covers a single day (one maximum); a day
+    that starts or ends with the sun above a threshold returns its first or last sample.
 
     Args:
         - solar_positions: DataFrame with at least an 'elevation' column indexed by
-          time.
+          time, or an (index, elevation array) tuple as from _get_elevation_array.
         - morning_threshold: Elevation threshold for determining the first sunlit time.
         - evening_threshold: Elevation threshold for determining the last sunlit time.
+        - as_pandas: If True (default), return tz-aware pd.Timestamp values from the
+          index; if False, return UTC np.datetime64[s] values, which avoids building
+          Timestamp objects.
 
     Returns:
         A tuple containing the first and last timestamps where elevation > threshold. If
@@ -90,40 +360,339 @@ def get_sunlit_times(
         ValueError: If 'elevation' column is not present in the solar_positions
         DataFrame.
     """
-    if "elevation" not in solar_positions.columns:
-        raise ValueError(
-            "Solar positions DataFrame must contain an 'elevation' column."
-        )
+    if isinstance(solar_positions, tuple):
+        index, elev = solar_positions
+        elev = np.asarray(elev)
+    else:
+        if "elevation" not in solar_positions.columns:
+            raise ValueError(
+                "Solar positions DataFrame must contain an 'elevation' column."
+            )
+        elev = solar_positions["elevation"].to_numpy(copy=False)
+        index = solar_positions.index
+    first_pos, last_pos = _sunlit_positions(elev, morning_threshold, evening_threshold)
+
+    def time_at(pos: int | None) -> SunlitTime:
+        if pos is None:
+            return None
+        if as_pandas:
+            return index[pos]
+        # DatetimeIndex.values holds the UTC instants as datetime64.
+        return index.values[pos].astype("datetime64[s]")
+
+    return time_at(first_pos), time_at(last_pos)
+
+
+def get_sunlit_times_zenith(
+    solar_positions: pd.DataFrame,
+) -> Tuple[pd.Timestamp | None, pd.Timestamp | None]:
+    """
+    Same as get_sunlit_times with the default thresholds, but working on the 'zenith'
+    column: elevation > threshold is zenith < 90 - threshold, so the pre-converted
+    ZENITH_*_THRESHOLD constants are compared directly, without converting each row.
+
+    Args:
+        - solar_positions: DataFrame with at least a 'zenith' column indexed by time.
+
+    Returns:
+        A tuple containing the first and last sunlit timestamps, or None for each if no
+        sunlit period is found.
+
+    Raises:
+        ValueError: If 'zenith' column is not present in the solar_positions DataFrame.
+    """
+    if "zenith" not in solar_positions.columns:
+        raise ValueError("Solar positions DataFrame must contain a 'zenith' column.")
+
+    zenith = solar_positions["zenith"].to_numpy(copy=False)
+    index = solar_positions.index
+    first_pos, last_pos = _sunlit_positions(
+        zenith, ZENITH_MORNING_THRESHOLD, ZENITH_EVENING_THRESHOLD, sign=-1
+    )
+    first_ray = index[first_pos] if first_pos is not None else None
+    last_ray = index[last_pos] if last_pos is not None else None
+    return first_ray, last_ray
+
+
+def _analytical_solar_noon(date_str: str, longitude: float = LONGITUDE) -> pd.Timestamp:
+    """
+    Approximate solar noon (to about a minute) from the longitude and Spencer's (1971)
+    equation of time, in the configured timezone.
+    """
+    day = pd.Timestamp(date_str)
+    eot = pvlib.solarposition.equation_of_time_spencer71(day.dayofyear)  # minutes
+    noon_utc = day.tz_localize("UTC") + pd.Timedelta(minutes=720 - 4 * longitude - eot)
+    return noon_utc.tz_convert(TIMEZONE)
+
+
+def get_sunlit_times_windowed(
+    date_str: str,
+    latitude: float = LATITUDE,
+    longitude: float = LONGITUDE,
+    altitude: float = ALTITUDE,
+    morning_threshold: float = -0.9,
+    evening_threshold: float = -0.833,
+    half_window: pd.Timedelta = pd.Timedelta(hours=8),
+) -> Tuple[pd.Timestamp | None, pd.Timestamp | None]:
+    """
+    Determine the first and last sunlit times on the 30 s grid of get_time_series, but
+    run the SPA only on the samples within half_window of the analytical solar noon,
+    skipping most of the night. If the sun is still above a threshold at an edge of the
+    window (long days, high latitudes), the full day is evaluated instead.
+
+    Args:
+        - date_str: A string representing the date (format defined in config).
+        - latitude: Latitude of the location.
+        - longitude: Longitude of the location.
+        - altitude: Altitude of the location in meters.
+        - morning_threshold: Elevation threshold for determining the first sunlit time.
+        - evening_threshold: Elevation threshold for determining the last sunlit time.
+        - half_window: Time on each side of solar noon to evaluate.
 
-    # Find first sunlit time (using morning threshold)
-    first_sunlit_df = solar_positions[solar_positions["elevation"] > morning_threshold]
-    first_ray = first_sunlit_df.index[0] if not first_sunlit_df.empty else None
+    Returns:
+        The same (first, last) tuple as get_sunlit_times on the full 30 s series.
+    """
+    day_times = get_time_series(date_str)
+    noon = _analytical_solar_noon(date_str, longitude)
+    times = day_times[day_times.slice_indexer(noon - half_window, noon + half_window)]
+    positions = _get_elevation_array(times, latitude, longitude, altitude)
+    elev = positions[1]
+    if len(elev) == 0 or elev.max() <= min(morning_threshold, evening_threshold):
+        return None, None  # Polar night (or no samples): the sun never rises.
+    if elev[0] > morning_threshold or elev[-1] > evening_threshold:
+        positions = _get_elevation_array(day_times, latitude, longitude, altitude)
+    return get_sunlit_times(positions, morning_threshold, evening_threshold)
 
-    # Find last sunlit time (using evening threshold)
-    last_sunlit_df = solar_positions[solar_positions["elevation"] > evening_threshold]
-    last_ray = last_sunlit_df.index[-1] if not last_sunlit_df.empty else None
 
+def compute_sunlit_times(
+    date_str: str,
+    latitude: float = LATITUDE,
+    longitude: float = LONGITUDE,
+    altitude: float = ALTITUDE,
+    morning_threshold: float = -0.9,
+    evening_threshold: float = -0.833,
+) -> Tuple[pd.Timestamp | None, pd.Timestamp | None]:
+    """
+    Determine the first and last sunlit times on the 30 s grid of get_time_series with
+    two passes: a 2 min scan of the whole day, then a 30 s scan of +/- 5 min around each
+    coarse crossing. This needs about 300 SPA evaluations instead of 2880.
+
+    Args:
+        - date_str: A string representing the date (format defined in config).
+        - latitude: Latitude of the location.
+        - longitude: Longitude of the location.
+        - altitude: Altitude of the location in meters.
+        - morning_threshold: Elevation threshold for determining the first sunlit time.
+        - evening_threshold: Elevation threshold for determining the last sunlit time.
+
+    Returns:
+        The same (first, last) tuple as get_sunlit_times on the full 30 s series.
+    """
+    coarse = _get_elevation_array(
+        get_time_series(date_str, freq="2min"), latitude, longitude, altitude
+    )
+    first_coarse, last_coarse = get_sunlit_times(
+        coarse, morning_threshold, evening_threshold
+    )
+    day_start, day_end = coarse[0][0], coarse[0][-1] + pd.Timedelta(minutes=2)
+
+    def refine(crossing: pd.Timestamp) -> Tuple[pd.DatetimeIndex, np.ndarray]:
+        window = pd.date_range(
+            start=max(crossing - pd.Timedelta(minutes=5), day_start),
+            end=min(crossing + pd.Timedelta(minutes=5), day_end - pd.Timedelta("30s")),
+            freq="30s",
+        )
+        return _get_elevation_array(window, latitude, longitude, altitude)
+
+    # The elevation only rises through the morning window and only falls through the
+    # evening one, so each refined search yields just the crossing on its side.
+    first_ray = last_ray = None
+    if first_coarse is not None:
+        first_ray, _ = get_sunlit_times(
+            refine(first_coarse), morning_threshold, evening_threshold
+        )
+    if last_coarse is not None:
+        _, last_ray = get_sunlit_times(
+            refine(last_coarse), morning_threshold, evening_threshold
+        )
     return first_ray, last_ray
 
 
+def find_ray_crossing(
+    date_str: str,
+    threshold: float,
+    side: str,
+    latitude: float = LATITUDE,
+    longitude: float = LONGITUDE,
+    altitude: float = ALTITUDE,
+) -> pd.Timestamp | None:
+    """
+    Find the instant the sun's elevation crosses a threshold with a root find on one
+    half of the day, instead of evaluating the SPA on a full time grid. The half-day is
+    bracketed by local midnight and the solar transit (noon) and scanned every
+    CROSSING_SCAN_STEP; each sign change brackets a crossing that brentq refines on the
+    float64 SPA elevation. At high latitudes a half-day can hold both a sunset and a
+    sunrise; the first rising crossing of the morning and the last setting crossing of
+    the evening are returned. Crossings closer together than the scan step are missed.
+
+    Args:
+        - date_str: A string representing the date (format defined in config).
+        - threshold: Elevation threshold in degrees (e.g. -0.9 or -0.833).
+        - side: 'morning' for the rising crossing, 'evening' for the setting one.
+        - latitude: Latitude of the location.
+        - longitude: Longitude of the location.
+        - altitude: Altitude of the location in meters.
+
+    Returns:
+        The crossing time, rounded to the second, in the configured timezone, or None if
+        the elevation does not cross the threshold that way on that side of the day.
+
+    Raises:
+        ValueError: If side is neither 'morning' nor 'evening'.
+    """
+    if side not in ("morning", "evening"):
+        raise ValueError("side must be either 'morning' or 'evening'.")
+
+    day_start = pd.Timestamp(date_str).tz_localize(TIMEZONE)
+    day_end = (pd.Timestamp(date_str) + pd.Timedelta(days=1)).tz_localize(TIMEZONE)
+    transit = pvlib.solarposition.sun_rise_set_transit_spa(
+        pd.DatetimeIndex([day_start]),
+        latitude,
+        longitude,
+        how="numba" if SOLAR_METHOD == "nrel_numba" else "numpy",
+    )["transit"].iloc[0]
+    start, end = (day_start, transit) if side == "morning" else (transit, day_end)
+    start_unixtime = start.timestamp()
+
+    def elevation_above_threshold(seconds: np.ndarray) -> np.ndarray:
+        unixtime = start_unixtime + np.atleast_1d(seconds).astype(np.float64)
+        return _spa_elevation(unixtime, latitude, longitude, altitude) - threshold
+
+    span = (end - start).total_seconds()
+    n_steps = max(1, int(np.ceil(span / CROSSING_SCAN_STEP.total_seconds())))
+    offsets = np.linspace(0.0, span, n_steps + 1)
+    above = elevation_above_threshold(offsets) > 0
+    if side == "morning":
+        brackets = np.flatnonzero(~above[:-1] & above[1:])
+    else:
+        brackets = np.flatnonzero(above[:-1] & ~above[1:])
+    if not len(brackets):
+        return None
+    k = brackets[0] if side == "morning" else brackets[-1]
+    seconds = brentq(
+        lambda s: elevation_above_threshold(s)[0], offsets[k], offsets[k + 1], xtol=0.5
+    )
+    return (start + pd.Timedelta(seconds=seconds)).round("s")
+
+
+def _to_unixtime(times: pd.DatetimeIndex) -> np.ndarray:
+    """
+    Convert a DatetimeIndex to float seconds since the epoch (naive times are UTC).
+    """
+    if times.tz is not None:
+        times = times.tz_convert("UTC").tz_localize(None)
+    return times.to_numpy(dtype="datetime64[ns]").view(np.int64) / 1e9
+
+
+def _spa_elevation(
+    unixtime: np.ndarray, latitude: float, longitude: float, altitude: float
+) -> np.ndarray:
+    """
+    Compute the float64 SPA elevation (without refraction, as the 'elevation' column of
+    get_solar_positions) at an array of Unix times by calling pvlib.spa directly, with
+    the same defaults as pvlib.solarposition.get_solarposition.
+    """
+    pressure = pvlib.atmosphere.alt2pres(altitude) / 100  # millibars
+    result = pvlib.spa.solar_position(
+        unixtime,
+        latitude,
+        longitude,
+        altitude,
+        pressure,
+        12.0,
+        67.0,
+        0.5667,
+        numthreads=1,
+    )
+    return result[3]
+
+
+def get_corner_elevations(
+    times: pd.DatetimeIndex,
+    corners: Dict[str, Tuple[float, float]] = TERRACE_CORNERS,
+    altitude: float = ALTITUDE,
+) -> Dict[str, Tuple[pd.DatetimeIndex, np.ndarray]]:
+    """
+    Compute the SPA elevation series for each terrace corner by calling pvlib.spa
+    directly: the unixtime conversion is done once for all corners and no DataFrame is
+    built. With numba, pvlib.spa is the compiled module once it has been warmed up.
+    Corners are computed in a thread pool: the numba SPA loop runs without the GIL and
+    the NumPy one spends its time in ufuncs, so the calls overlap on multi-core
+    machines. There is one call per unique corner site rather than one batch over every
+    (corner, time) pair, because pvlib's numba SPA only takes a scalar location and a
+    NumPy-mode copy of pvlib.spa can only be imported by changing PVLIB_USE_NUMBA.
+
+    Args:
+        - times: A pandas DatetimeIndex representing time intervals.
+        - corners: A dictionary mapping corner labels to (latitude, longitude) tuples.
+        - altitude: Altitude of the corners in meters.
+
+    Returns:
+        A dictionary mapping each corner label to an (index, elevation array) tuple, as
+        accepted by get_sunlit_times.
+    """
+    unixtime = _to_unixtime(times)
+    sites = list(dict.fromkeys(corners.values()))
+
+    def site_elevation(site: Tuple[float, float]) -> np.ndarray:
+        lat, lon = site
+        return _spa_elevation(unixtime, lat, lon, altitude)
+
+    with ThreadPoolExecutor(max_workers=len(sites) or 1) as executor:
+        site_elevations = dict(zip(sites, executor.map(site_elevation, sites)))
+    return {corner: (times, site_elevations[site]) for corner, site in corners.items()}
+
+
+# Compile the numba SPA kernels at import time instead of on the first user call.
+if SOLAR_METHOD == "nrel_numba":
+    warm_up_solar_positions()
+
+
 if __name__ == "__main__":
     # For testing purposes: run the calculations for today's date.
     today = datetime.now().strftime(DATE_FORMAT)
     times = get_time_series(today)
 
     # Test using the default location from config.
-    solar_pos_default = get_solar_positions(times)
+    solar_pos_default = get_cached_elevation(today)
     first_ray_default, last_ray_default = get_sunlit_times(solar_pos_default)
     print("Default location (from config):")
     print("  First sunlit time:", first_ray_default)
     print("  Last sunlit time:", last_ray_default)
+    first_ray_fast, last_ray_fast = get_sunlit_times(get_solar_positions_fast(times))
+    print("  First sunlit time (fast path):", first_ray_fast)
+    print("  Last sunlit time (fast path):", last_ray_fast)
+    print("  First crossing (root find):", find_ray_crossing(today, -0.9, "morning"))
+    print("  Last crossing (root find):", find_ray_crossing(today, -0.833, "evening"))
 
     print("\nTerrace Corners Sunlit Times:")
-    for corner, (lat, lon) in TERRACE_CORNERS.items():
-        solar_pos_corner = get_solar_positions(
-            times, latitude=lat, longitude=lon, altitude=ALTITUDE
-        )
-        first_ray, last_ray = get_sunlit_times(solar_pos_corner)
+    for corner, elevations in get_corner_elevations(times).items():
+        first_ray, last_ray = get_sunlit_times(elevations)
         print(
             f"  {corner}: First sunlit time: {first_ray}, Last sunlit time: {last_ray}"
         )
+
+    if SOLAR_METHOD == "nrel_numba":
+        # One fused numba scan over all corners with the analytical (~0.01 deg) model.
+        from src.solar_fast import get_sunlit_positions_fast
+
+        print("\nTerrace Corners Sunlit Times (analytical kernel):")
+        lats, lons = np.array(list(TERRACE_CORNERS.values())).T
+        positions = get_sunlit_positions_fast(times, lats, lons)
+        for corner, (first, last) in zip(TERRACE_CORNERS, positions):
+            first_ray = times[first] if first >= 0 else None
+            last_ray = times[last] if last >= 0 else None
+            print(
+                f"  {corner}: First sunlit time: {first_ray}, "
+                f"Last sunlit time: {last_ray}"
+            )
@@ -0,0 +1,190 @@
+"""
+Numba kernels for fast, approximate solar elevation of the Arbalete Sunlight Analysis
+project.
+
+Uses the low-precision analytical solar position (the US Naval Observatory almanac
+formulas: mean longitude and anomaly -> ecliptic longitude -> declination and right
+ascension -> local hour angle -> elevation). It is accurate to about 0.01 degrees
+between 1950 and 2050, which is enough to locate refraction-threshold crossings, and
+avoids the full NREL SPA for multi-location batches:
+  - jd_array: (T,) Julian days (UTC).
+  - lats, lons: (L,) location latitudes and longitudes, in degrees.
+  - result: (T, L) geometric elevation (no refraction), in degrees.
+
+At Geneva's latitude the threshold crossings found with get_sunlit_times on these
+elevations fall on the same 30 s samples as with the SPA. Near the polar circles, where
+the sun grazes the horizon and the 0.01 degree error spans minutes, they drift (at 78.2N
+on 2026-02-15: 11:40:30/12:33:30 against the SPA's 11:41:30/12:32:00).
+
+Functions:
+    - elevation_kernel(jd_array: np.ndarray, lats: np.ndarray, lons: np.ndarray)
+      -> np.ndarray
+    - get_elevations_fast(times: pd.DatetimeIndex, lats: np.ndarray,
+      lons: np.ndarray) -> np.ndarray
+    - get_sunlit_positions_fast(times: pd.DatetimeIndex, lats: np.ndarray,
+      lons: np.ndarray, morning_threshold: float = -0.9,
+      evening_threshold: float = -0.833) -> np.ndarray
+"""
+
+import numpy as np
+import pandas as pd
+from numba import njit, prange
+
+# Julian day of the J2000.0 epoch.
+J2000 = 2451545.0
+# Samples in a 24 h day at 30 s, the shape of get_time_series outside DST changes.
+N_DAY_30S = 2880
+
+
+@njit(cache=True, fastmath=True)
+def _sun_coords(jd):
+    """
+    Right ascension, sine/cosine of declination and Greenwich mean sidereal time (all
+    angles in radians) at Julian day jd.
+    """
+    n = jd - J2000
+    mean_lon = np.radians((280.460 + 0.9856474 * n) % 360.0)
+    mean_anom = np.radians((357.528 + 0.9856003 * n) % 360.0)
+    ecl_lon = (
+        mean_lon
+        + np.radians(1.915) * np.sin(mean_anom)
+        + np.radians(0.020) * np.sin(2.0 * mean_anom)
+    )
+    obliquity = np.radians(23.439 - 0.0000004 * n)
+    right_asc = np.arctan2(np.cos(obliquity) * np.sin(ecl_lon), np.cos(ecl_lon))
+    sin_dec = np.sin(obliquity) * np.sin(ecl_lon)
+    cos_dec = np.sqrt(1.0 - sin_dec * sin_dec)
+    # Greenwich mean sidereal time (the series is in degrees).
+    gmst = np.radians((280.46061837 + 360.98564736629 * n) % 360.0)
+    return right_asc, sin_dec, cos_dec, gmst
+
+
+@njit(cache=True, fastmath=True)
+def _elevation(right_asc, sin_dec, cos_dec, gmst, sin_lat, cos_lat, lon):
+    """
+    Solar elevation in degrees for one location (lon in radians).
+    """
+    hour_angle = gmst + lon - right_asc
+    sin_elev = sin_lat * sin_dec + cos_lat * cos_dec * np.cos(hour_angle)
+    return np.degrees(np.arcsin(sin_elev))
+
+
+@njit(parallel=True, fastmath=True, cache=True)
+def elevation_kernel(jd_array, lats, lons):
+    """
+    Compute the solar elevation for T times and L locations in one parallel pass over
+    the time axis.
+
+    Args:
+        jd_array: (T,) float64 array of Julian days (UTC).
+        lats: (L,) float64 array of latitudes in degrees.
+        lons: (L,) float64 array of longitudes in degrees (east positive).
+
+    Returns:
+        A (T, L) float64 array of solar elevations in degrees.
+    """
+    n_times = jd_array.shape[0]
+    n_locs = lats.shape[0]
+    elev = np.empty((n_times, n_locs))
+    sin_lats = np.sin(np.radians(lats))
+    cos_lats = np.cos(np.radians(lats))
+    lon_rads = np.radians(lons)
+    for t in prange(n_times):
+        right_asc, sin_dec, cos_dec, gmst = _sun_coords(jd_array[t])
+        for l in range(n_locs):
+            elev[t, l] = _elevation(
+                right_asc, sin_dec, cos_dec, gmst, sin_lats[l], cos_lats[l], lon_rads[l]
+            )
+    return elev
+
+
+@njit(parallel=True, fastmath=True, cache=True, boundscheck=False)
+def _sunlit_crossings_2880(jd0, lats, lons, morning_th, evening_th):
+    """
+    Scan N_DAY_30S samples 30 s apart from Julian day jd0 for each location, without
+    storing the elevations, and return an (L, 2) array with the positions of the first
+    sample above morning_th and of the last above evening_th (-1 if none). The loop
+    length is a compile-time constant.
+    """
+    step = 30.0 / 86400.0
+    n_locs = lats.shape[0]
+    positions = np.full((n_locs, 2), -1, dtype=np.int64)
+    for l in prange(n_locs):
+        sin_lat = np.sin(np.radians(lats[l]))
+        cos_lat = np.cos(np.radians(lats[l]))
+        lon_rad = np.radians(lons[l])
+        for k in range(N_DAY_30S):
+            right_asc, sin_dec, cos_dec, gmst = _sun_coords(jd0 + k * step)
+            e = _elevation(right_asc, sin_dec, cos_dec, gmst, sin_lat, cos_lat, lon_rad)
+            if positions[l, 0] < 0 and e > morning_th:
+                positions[l, 0] = k
+            if e > evening_th:
+                positions[l, 1] = k
+    return positions
+
+
+def get_elevations_fast(
+    times: pd.DatetimeIndex, lats: np.ndarray, lons: np.ndarray
+) -> np.ndarray:
+    """
+    Compute approximate solar elevations for several locations with elevation_kernel.
+
+    Args:
+        - times: A tz-aware pandas DatetimeIndex.
+        - lats: 1D array of latitudes.
+        - lons: 1D array of longitudes (same length as lats).
+
+    Returns:
+        A (len(times), len(lats)) array of solar elevations in degrees.
+    """
+    jd = times.tz_convert("UTC").to_julian_date().to_numpy()
+    return elevation_kernel(
+        jd, np.asarray(lats, dtype=np.float64), np.asarray(lons, dtype=np.float64)
+    )
+
+
+
+def get_sunlit_positions_fast(
+    times: pd.DatetimeIndex,
+    lats: np.ndarray,
+    lons: np.ndarray,
+    morning_threshold: float = -0.9,
+    evening_threshold: float = -0.833,
+) -> np.ndarray:
+    """
+    Find the first and last sunlit samples of several locations on the analytical
+    elevation. For a 24 h day at 30 s (N_DAY_30S samples) the fused
+    _sunlit_crossings_2880 kernel scans each location without materializing the
+    elevations; other series, such as DST-change days, go through elevation_kernel.
+    The positions are those of the first sample above morning_threshold and of the last
+    above evening_threshold, which is what get_sunlit_times returns for a day with a
+    single elevation peak.
+
+    Args:
+        - times: A tz-aware pandas DatetimeIndex.
+        - lats: 1D array of latitudes.
+        - lons: 1D array of longitudes (same length as lats).
+        - morning_threshold: Elevation threshold for the first sunlit sample.
+        - evening_threshold: Elevation threshold for the last sunlit sample.
+
+    Returns:
+        A (len(lats), 2) int array of (first, last) positions in times, -1 where the
+        elevation never exceeds the threshold.
+    """
+    lats = np.asarray(lats, dtype=np.float64)
+    lons = np.asarray(lons, dtype=np.float64)
+    if len(times) == N_DAY_30S and times.freq == pd.Timedelta("30s"):
+        jd0 = times[:1].tz_convert("UTC").to_julian_date()[0]
+        return _sunlit_crossings_2880(
+            jd0, lats, lons, morning_threshold, evening_threshold
+        )
+    elev = get_elevations_fast(times, lats, lons)
+    positions = np.full((len(lats), 2), -1, dtype=np.int64)
+    for l in range(len(lats)):
+        (above_morning,) = np.nonzero(elev[:, l] > morning_threshold)
+        (above_evening,) = np.nonzero(elev[:, l] > evening_threshold)
+        if len(above_morning):
+            positions[l, 0] = above_morning[0]
+        if len(above_evening):
+            positions[l, 1] = above_evening[-1]
+    return positions
@@ -0,0 +1,53 @@
+import io
+import threading
+import zipfile
+
+import requests
+
+from src import download_gml
+
+
+class _FakeResponse:
+    def __init__(self, payload):
+        self.raw = io.BytesIO(payload)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def raise_for_status(self):
+        pass
+
+
+def _zip_with_gml(name, content):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as zip_file:
+        zip_file.writestr(name, content)
+    return buffer.getvalue()
+
+
+def test_process_csv_downloads_concurrently_with_one_session(tmp_path, monkeypatch):
+    urls = [f"https://example.com/tile_{i}.zip" for i in range(4)]
+    csv_path = tmp_path / "urls.csv"
+    csv_path.write_text("url\n" + "\n".join(urls) + "\n")
+    # Every download waits until all four are in flight, so a sequential run would
+    # time out and extract nothing.
+    barrier = threading.Barrier(len(urls), timeout=10)
+    sessions = set()
+
+    def fake_get(session, url, stream=False):
+        sessions.add(id(session))
+        barrier.wait()
+        name = url.rsplit("/", 1)[-1].replace(".zip", ".gml")
+        return _FakeResponse(_zip_with_gml(name, url))
+
+    monkeypatch.setattr(requests.Session, "get", fake_get)
+
+    data_dir = tmp_path / "data"
+    download_gml.process_csv(str(csv_path), str(data_dir), max_workers=len(urls))
+
+    assert len(sessions) == 1
+    for i, url in enumerate(urls):
+        assert (data_dir / f"tile_{i}.gml").read_text() == url
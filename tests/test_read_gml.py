@@ -0,0 +1,114 @@
+import numpy as np
+import pytest
+import shapely
+from shapely.geometry import Polygon
+from shapely.ops import triangulate
+
+from src import read_gml
+
+CITYGML = b"""<?xml version="1.0" encoding="UTF-8"?>
+<!-- comment before the root element -->
+<core:CityModel xmlns:core="http://www.opengis.net/citygml/2.0"
+    xmlns:bldg="http://www.opengis.net/citygml/building/2.0">
+  <core:cityObjectMember>
+    <bldg:Building><bldg:EGID>1</bldg:EGID></bldg:Building>
+  </core:cityObjectMember>
+  <core:cityObjectMember>
+    <bldg:Building><bldg:EGID>2</bldg:EGID></bldg:Building>
+  </core:cityObjectMember>
+</core:CityModel>
+"""
+
+
+def test_iter_buildings_with_content_before_root(tmp_path):
+    path = tmp_path / "buildings.gml"
+    path.write_bytes(CITYGML)
+
+    egids = [read_gml.extract_egid(b) for b in read_gml.iter_buildings(str(path))]
+
+    assert egids == ["1", "2"]
+
+
+
+def test_weld_vertices_round_trip():
+    rng = np.random.default_rng(0)
+    # Distinct LV95-scale corners, each repeated a few times in shuffled order.
+    unique = np.array([2_500_000.0, 1_117_000.0, 400.0]) + rng.uniform(
+        0.0, 50.0, size=(200, 3)
+    )
+    points = unique[rng.permutation(np.repeat(np.arange(200), 4))]
+
+    vertices, inverse = read_gml.weld_vertices(points)
+
+    assert len(vertices) == len(unique)
+    assert inverse.shape == (len(points),)
+    np.testing.assert_allclose(vertices[inverse], points, rtol=0, atol=1e-9)
+
+
+def test_weld_vertices_merges_points_within_a_cell():
+    points = np.array([[0.0, 0.0, 0.0], [0.0, 0.0, 1e-8], [1.0, 0.0, 0.0]])
+
+    vertices, inverse = read_gml.weld_vertices(points, eps=1e-6)
+
+    assert len(vertices) == 2
+    assert inverse[0] == inverse[1] != inverse[2]
+
+
+def test_weld_vertices_merges_points_across_a_cell_boundary():
+    # The middle points are 2e-13 apart but fall on either side of the 3e-6 boundary.
+    points = np.array(
+        [[0.0, 0.0, 0.0], [3e-6 - 1e-13, 0.0, 0.0], [3e-6 + 1e-13, 0.0, 0.0]]
+    )
+    points = np.vstack([points, [1.0, 1.0, 1.0]])
+
+    vertices, inverse = read_gml.weld_vertices(points, eps=1e-6)
+
+    assert len(vertices) == 3
+    assert inverse[1] == inverse[2]
+    assert len({inverse[0], inverse[1], inverse[3]}) == 3
+
+
+def test_weld_vertices_warns_when_the_cell_is_widened():
+    points = np.array([[0.0, 0.0, 0.0], [1000.0, 0.0, 0.0]])
+
+    with pytest.warns(UserWarning, match="tolerance"):
+        vertices, _ = read_gml.weld_vertices(points, eps=1e-6)
+
+    assert len(vertices) == 2
+
+
+def test_triangulate_surface_fan_covers_convex_surfaces():
+    angles = np.linspace(0.0, 2.0 * np.pi, 7)[:-1]
+    ring = np.column_stack(
+        [
+            2_500_000.0 + 5.0 * np.cos(angles),
+            1_117_000.0 + 3.0 * np.sin(angles),
+            np.linspace(400.0, 401.0, 6),
+        ]
+    )
+    points = np.vstack([ring, ring[:1]])
+    footprint = Polygon(points[:, :2])
+
+    tris = read_gml.triangulate_surface(points)
+
+    # Same triangle count, area and coverage as shapely's triangulation.
+    expected = triangulate(footprint)
+    assert tris.shape == (len(expected), 3, 3)
+    fan = shapely.union_all([Polygon(tri[:, :2]) for tri in tris])
+    assert sum(Polygon(tri[:, :2]).area for tri in tris) == pytest.approx(
+        footprint.area
+    )
+    assert fan.symmetric_difference(footprint).area < 1e-6
+    np.testing.assert_allclose(tris[:, :, 2], points[:, 2].mean())
+
+
+def test_triangulate_surface_uses_shapely_for_concave_surfaces():
+    # An L-shaped surface.
+    xy = [(0, 0), (4, 0), (4, 1), (1, 1), (1, 3), (0, 3), (0, 0)]
+    points = np.column_stack([np.array(xy, dtype=float), np.full(len(xy), 10.0)])
+
+    tris = read_gml.triangulate_surface(points)
+
+    expected = [np.asarray(t.exterior.coords)[:-1] for t in triangulate(Polygon(xy))]
+    np.testing.assert_allclose(tris[:, :, :2], expected)
+    np.testing.assert_allclose(tris[:, :, 2], 10.0)
@@ -0,0 +1,84 @@
+import numpy as np
+import pandas as pd
+import trimesh
+
+from src import shading
+
+CENTER = np.zeros(3)
+
+
+def _solar_positions(n=241):
+    """A synthetic day: the sun sweeps from east to west, peaking at 60 degrees."""
+    times = pd.date_range("2026-06-21 06:00", periods=n, freq="3min", tz="UTC")
+    phase = np.linspace(0.0, 1.0, n)
+    elevation = 60.0 * np.sin(np.pi * phase) - 0.5
+    azimuth = 90.0 + 180.0 * phase
+    return pd.DataFrame({"elevation": elevation, "azimuth": azimuth}, index=times)
+
+
+def _box(extents, center):
+    box = trimesh.creation.box(extents=extents)
+    box.apply_translation(center)
+    return box
+
+
+def _sunlit(solar_positions, building):
+    """Brute force: cast one ray per sample above the horizon."""
+    dirs = shading.sun_direction_vector(
+        solar_positions["azimuth"].to_numpy(), solar_positions["elevation"].to_numpy()
+    )
+    origins = np.broadcast_to(CENTER + [0.0, 0.0, 1.0], dirs.shape)
+    hits = building.ray.intersects_any(ray_origins=origins, ray_directions=dirs)
+    return ~hits & (solar_positions["elevation"].to_numpy() > -0.833)
+
+
+def _last_sunray_time(solar_positions, building):
+    return shading.get_shadow_adjusted_last_sunray_time(
+        solar_positions.index, solar_positions, CENTER, building
+    )
+
+
+def test_last_sunray_time_matches_full_scan_for_one_afternoon_shadow():
+    solar_positions = _solar_positions()
+    # A wall to the west shades the terrace from mid-afternoon to sunset.
+    wall = _box((1.0, 40.0, 10.0), (-10.0, 0.0, 5.0))
+    sunlit = _sunlit(solar_positions, wall)
+    assert sunlit.any() and not sunlit[-10:].any()
+
+    expected = solar_positions.index[np.flatnonzero(sunlit)[-1]]
+
+    assert _last_sunray_time(solar_positions, wall) == expected
+
+
+def test_last_sunray_time_shaded_at_the_peak_scans_every_sample():
+    solar_positions = _solar_positions()
+    # A roof over the sensor shades the high sun, a wall the low western sun.
+    building = trimesh.util.concatenate(
+        [
+            _box((6.0, 6.0, 1.0), (0.0, 0.0, 5.5)),
+            _box((1.0, 40.0, 3.0), (-10.0, 0.0, 1.5)),
+        ]
+    )
+    sunlit = _sunlit(solar_positions, building)
+    peak = int(solar_positions["elevation"].to_numpy().argmax())
+    assert not sunlit[peak] and sunlit[peak:].any()
+
+    expected = solar_positions.index[np.flatnonzero(sunlit)[-1]]
+
+    assert _last_sunray_time(solar_positions, building) == expected
+
+
+def test_last_sunray_time_returns_a_transition_for_a_passing_shadow():
+    solar_positions = _solar_positions()
+    # A thin pole to the south-west shades the terrace briefly, then the sun returns.
+    pole = _box((1.0, 1.0, 60.0), (-7.07, -7.07, 30.0))
+    sunlit = _sunlit(solar_positions, pole)
+    peak = int(solar_positions["elevation"].to_numpy().argmax())
+    assert not sunlit[peak:].all() and sunlit[-1]
+
+    # The afternoon is assumed to be shaded at most once, so the result is the last
+    # sunlit sample before a shaded one, not necessarily the last sunlit sample.
+    result = _last_sunray_time(solar_positions, pole)
+    pos = solar_positions.index.get_loc(result)
+
+    assert pos >= peak and sunlit[pos] and not sunlit[pos + 1]
@@ -0,0 +1,30 @@
+import numpy as np
+import trimesh
+from trimesh.ray.ray_triangle import RayMeshIntersector
+
+from src.shading_numba import any_hit
+
+
+def test_any_hit_matches_trimesh():
+    rng = np.random.default_rng(0)
+    mesh = trimesh.creation.box(extents=(10.0, 6.0, 4.0))
+    # Origins around and inside the box, pointing in random directions.
+    origins = rng.uniform(-12.0, 12.0, size=(2000, 3))
+    directions = rng.normal(size=(2000, 3))
+    directions /= np.linalg.norm(directions, axis=1, keepdims=True)
+
+    hits = any_hit(origins, directions, mesh.triangles)
+    expected = RayMeshIntersector(mesh).intersects_any(origins, directions)
+
+    assert hits.any() and not hits.all()
+    np.testing.assert_array_equal(hits, expected)
+
+
+def test_any_hit_ignores_triangles_behind_the_origin():
+    tri = np.array([[[0.0, 0.0, 0.0], [1.0, 0.0, 0.0], [0.0, 1.0, 0.0]]])
+    origins = np.array([[0.2, 0.2, 1.0], [0.2, 0.2, 1.0], [2.0, 2.0, 1.0]])
+    directions = np.array([[0.0, 0.0, -1.0], [0.0, 0.0, 1.0], [0.0, 0.0, -1.0]])
+
+    np.testing.assert_array_equal(
+        any_hit(origins, directions, tri), [True, False, False]
+    )
@@ -0,0 +1,230 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src import solar
+
+
+def _baseline_sunlit_times(solar_positions, morning=-0.9, evening=-0.833):
+    """The original boolean-mask implementation of get_sunlit_times."""
+    morning_rows = solar_positions[solar_positions["elevation"] > morning]
+    evening_rows = solar_positions[solar_positions["elevation"] > evening]
+    first = morning_rows.index[0] if not morning_rows.empty else None
+    last = evening_rows.index[-1] if not evening_rows.empty else None
+    return first, last
+
+
+def test_get_sunlit_times_day_starting_in_sunlight():
+    # Midnight sun: the Europe/Zurich day starts with the sun above the threshold.
+    times = solar.get_time_series("2026-07-27")
+    solar_positions = solar.get_solar_positions(times, 69.65, 18.96)
+
+    first, last = solar.get_sunlit_times(solar_positions)
+
+    assert first == times[0]
+    assert (first, last) == _baseline_sunlit_times(solar_positions)
+
+
+def test_get_sunlit_times_zenith_day_starting_in_sunlight():
+    times = solar.get_time_series("2026-07-27")
+    solar_positions = solar.get_solar_positions(times, 69.65, 18.96)
+
+    assert solar.get_sunlit_times_zenith(solar_positions) == _baseline_sunlit_times(
+        solar_positions
+    )
+
+
+def test_get_sunlit_times_windowed_matches_full_day():
+    # A morning threshold above the day's maximum still leaves a last sunlit time.
+    date_str = "2026-12-21"
+    solar_positions = solar.get_solar_positions(solar.get_time_series(date_str))
+    for morning, evening in [(-0.9, -0.833), (30.0, -0.833)]:
+        expected = solar.get_sunlit_times(solar_positions, morning, evening)
+
+        assert solar.get_sunlit_times_windowed(
+            date_str, morning_threshold=morning, evening_threshold=evening
+        ) == expected
+    assert expected[0] is None and expected[1] is not None
+
+
+
+# Regular, solstice and both DST-change days.
+DATES = ["2026-01-15", "2026-03-29", "2026-06-21", "2026-10-25", "2026-12-21"]
+
+
+@pytest.mark.parametrize("date_str", DATES)
+def test_get_sunlit_times_matches_baseline(date_str):
+    solar_positions = solar.get_solar_positions(solar.get_time_series(date_str))
+    expected = _baseline_sunlit_times(solar_positions)
+
+    assert expected[0] is not None and expected[1] is not None
+    assert solar.get_sunlit_times(solar_positions) == expected
+
+
+def test_get_sunlit_times_polar_night():
+    times = solar.get_time_series("2026-12-21")
+    solar_positions = solar.get_solar_positions(times, 78.2, 15.6)
+
+    assert solar.get_sunlit_times(solar_positions) == (None, None)
+
+
+@pytest.mark.parametrize(
+    "date_str, latitude, longitude",
+    [
+        ("2026-06-21", solar.LATITUDE, solar.LONGITUDE),
+        ("2026-12-21", solar.LATITUDE, solar.LONGITUDE),
+        # The sun sets just after local midnight and rises again before transit, so
+        # the morning half-day holds two crossings.
+        ("2026-07-27", 69.65, 18.96),
+    ],
+)
+def test_find_ray_crossing_brackets_the_grid_crossing(date_str, latitude, longitude):
+    times = solar.get_time_series(date_str)
+    solar_positions = solar.get_solar_positions(times, latitude, longitude)
+    above = solar_positions["elevation"].to_numpy() > -0.9
+    first_rise = times[np.flatnonzero(~above[:-1] & above[1:])[0] + 1]
+    above = solar_positions["elevation"].to_numpy() > -0.833
+    last_set = times[np.flatnonzero(above[:-1] & ~above[1:])[-1]]
+
+    morning = solar.find_ray_crossing(date_str, -0.9, "morning", latitude, longitude)
+    evening = solar.find_ray_crossing(date_str, -0.833, "evening", latitude, longitude)
+
+    # Each crossing lies within the 30 s step that the grid crossing falls in.
+    step = pd.Timedelta("30s")
+    assert first_rise - step <= morning <= first_rise
+    assert last_set <= evening <= last_set + step
+
+
+@pytest.fixture
+def disk_cache_dir(tmp_path, monkeypatch):
+    """Point the elevation disk cache at a temporary directory."""
+    pytest.importorskip("joblib")
+    monkeypatch.setattr(solar, "SOLAR_CACHE_DIR", str(tmp_path))
+    solar._get_disk_cached_elevation.cache_clear()
+    solar.get_cached_elevation.cache_clear()
+    yield tmp_path
+    solar._get_disk_cached_elevation.cache_clear()
+    solar.get_cached_elevation.cache_clear()
+
+
+def test_get_cached_elevation_reads_back_from_disk(disk_cache_dir, monkeypatch):
+    date_str = "2026-06-21"
+    _, expected = solar._get_elevation_array(solar.get_time_series(date_str))
+
+    first = solar.get_cached_elevation(date_str)
+
+    np.testing.assert_array_equal(first["elevation"].to_numpy(), expected)
+    (cache_dir,) = disk_cache_dir.iterdir()
+    assert cache_dir.name.startswith(f"v{solar.CACHE_VERSION}-")
+
+    # Once the in-process cache is cleared, the SPA must not run again.
+    def fail(*args, **kwargs):
+        raise AssertionError("elevations were recomputed")
+
+    solar.get_cached_elevation.cache_clear()
+    monkeypatch.setattr(solar, "_get_elevation_array", fail)
+    second = solar.get_cached_elevation(date_str)
+
+    np.testing.assert_array_equal(second["elevation"].to_numpy(), expected)
+    assert second.index.equals(solar.get_time_series(date_str))
+
+
+@pytest.mark.parametrize("date_str", DATES)
+def test_get_sunlit_times_float32_array_matches_baseline(date_str):
+    times = solar.get_time_series(date_str)
+    index, elevation = solar._get_elevation_array(times)
+
+    assert elevation.dtype == np.float32
+    assert solar.get_sunlit_times(
+        (index, elevation)
+    ) == _baseline_sunlit_times(solar.get_solar_positions(times))
+
+
+@pytest.mark.parametrize("date_str", DATES)
+def test_compute_sunlit_times_matches_baseline(date_str):
+    solar_positions = solar.get_solar_positions(solar.get_time_series(date_str))
+
+    assert solar.compute_sunlit_times(date_str) == _baseline_sunlit_times(
+        solar_positions
+    )
+
+
+def test_get_time_series_is_memoized_per_date_and_freq():
+    times = solar.get_time_series("2026-06-21")
+
+    assert solar.get_time_series("2026-06-21") is times
+    assert solar.get_time_series("2026-06-21", freq="2min") is not times
+    assert solar.get_time_series("2026-06-22") is not times
+
+
+def test_get_corner_elevations_match_get_solar_positions():
+    times = solar.get_time_series("2026-03-29")
+
+    corner_elevations = solar.get_corner_elevations(times)
+
+    assert list(corner_elevations) == list(solar.TERRACE_CORNERS)
+    for corner, (lat, lon) in solar.TERRACE_CORNERS.items():
+        index, elevation = corner_elevations[corner]
+        expected = solar.get_solar_positions(times, lat, lon)["elevation"]
+        assert index.equals(times)
+        np.testing.assert_allclose(elevation, expected.to_numpy(), rtol=0, atol=1e-9)
+
+
+def test_get_corner_elevations_computes_each_site_once():
+    times = solar.get_time_series("2026-06-21")
+    corners = {
+        "A": (46.2, 6.15),
+        "B": (69.65, 18.96),
+        "C": (46.2, 6.15),
+        "D": (-33.9, 18.4),
+    }
+
+    corner_elevations = solar.get_corner_elevations(times, corners)
+
+    # Corners at the same site share one array; each thread's result lands on its
+    # own site.
+    assert corner_elevations["A"][1] is corner_elevations["C"][1]
+    for corner, (lat, lon) in corners.items():
+        expected = solar.get_solar_positions(times, lat, lon)["elevation"]
+        np.testing.assert_allclose(
+            corner_elevations[corner][1], expected.to_numpy(), rtol=0, atol=1e-9
+        )
+
+
+@pytest.mark.parametrize(
+    "date_str, hours", [("2026-03-29", 23), ("2026-06-21", 24), ("2026-10-25", 25)]
+)
+def test_get_time_series_covers_dst_days(date_str, hours):
+    times = solar.get_time_series(date_str)
+    hourly = solar.get_time_series(date_str, freq="h")
+
+    assert len(times) == hours * 120
+    assert len(hourly) == hours
+    assert hourly[0] == pd.Timestamp(date_str, tz=solar.TIMEZONE)
+    assert (hourly[1:] - hourly[:-1] == pd.Timedelta(hours=1)).all()
+    # A calendar-day offset (not a Tick in pandas 3), as pd.date_range accepts.
+    assert len(solar.get_time_series(date_str, freq="D")) == 1
+
+
+def test_get_sunlit_times_as_numpy_datetime64():
+    solar_positions = solar.get_solar_positions(solar.get_time_series("2026-10-25"))
+
+    first, last = solar.get_sunlit_times(solar_positions)
+    first_np, last_np = solar.get_sunlit_times(solar_positions, as_pandas=False)
+
+    assert first_np.dtype == last_np.dtype == np.dtype("datetime64[s]")
+    assert pd.Timestamp(first_np).tz_localize("UTC") == first
+    assert pd.Timestamp(last_np).tz_localize("UTC") == last
+    assert solar.get_sunlit_times(
+        solar.get_solar_positions(solar.get_time_series("2026-12-21"), 78.2, 15.6),
+        as_pandas=False,
+    ) == (None, None)
+
+
+@pytest.mark.parametrize("date_str", DATES)
+def test_get_sunlit_times_zenith_matches_baseline(date_str):
+    solar_positions = solar.get_solar_positions(solar.get_time_series(date_str))
+
+    assert solar.get_sunlit_times_zenith(solar_positions) == _baseline_sunlit_times(
+        solar_positions
+    )
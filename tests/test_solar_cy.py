@@ -0,0 +1,40 @@
+import numpy as np
+import pytest
+
+from src import solar
+from src.solar_fast import get_elevations_fast
+
+solar_cy = pytest.importorskip(
+    "src._solar_cy", reason="build with `python setup.py build_ext --inplace`"
+)
+
+
+def test_elevations_match_numba_kernel():
+    times = solar.get_time_series("2026-06-21")
+    lat, lon = solar.LATITUDE, solar.LONGITUDE
+
+    cython_elev = solar_cy.elevations(solar._to_unixtime(times), lat, lon)
+    numba_elev = get_elevations_fast(times, [lat], [lon])[:, 0]
+
+    np.testing.assert_allclose(cython_elev, numba_elev, rtol=0, atol=1e-6)
+
+
+def test_get_solar_positions_fast_uses_extension():
+    times = solar.get_time_series("2026-06-21")
+
+    fast = solar.get_solar_positions_fast(times)
+    spa = solar.get_solar_positions(times)
+
+    assert solar._cy_elevations is not None
+    assert solar.get_sunlit_times(fast) == solar.get_sunlit_times(spa)
+
+
+def test_elevations_match_get_solar_positions():
+    # The kernel is compiled without -ffast-math; it stays within the analytical
+    # model's accuracy of the SPA.
+    times = solar.get_time_series("2026-03-29")
+
+    cython_elev = solar_cy.elevations(solar._to_unixtime(times), 46.2, 6.15)
+    spa = solar.get_solar_positions(times, 46.2, 6.15)["elevation"].to_numpy()
+
+    assert np.abs(cython_elev - spa).max() < 0.01
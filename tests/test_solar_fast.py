@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+
+from src import solar
+from src.config import TERRACE_CORNERS
+from src.solar_fast import get_elevations_fast, get_sunlit_positions_fast
+
+# Regular, solstice and both DST-change days.
+DATES = ["2026-03-29", "2026-06-21", "2026-10-25", "2026-12-21"]
+
+
+@pytest.mark.parametrize("date_str", DATES)
+def test_sunlit_times_match_spa_at_the_terrace(date_str):
+    times = solar.get_time_series(date_str)
+    lats, lons = np.array(list(TERRACE_CORNERS.values())).T
+    fast = get_elevations_fast(times, lats, lons)
+
+    for i, (lat, lon) in enumerate(TERRACE_CORNERS.values()):
+        spa = solar.get_solar_positions(times, lat, lon)
+        assert np.abs(fast[:, i] - spa["elevation"].to_numpy()).max() < 0.01
+        assert solar.get_sunlit_times((times, fast[:, i])) == solar.get_sunlit_times(
+            spa
+        )
+
+
+@pytest.mark.parametrize(
+    "date_str, lats, lons",
+    [(date_str, *np.array(list(TERRACE_CORNERS.values())).T) for date_str in DATES]
+    # A day that starts and ends with the sun up.
+    + [("2026-07-27", np.array([69.65]), np.array([18.96]))],
+)
+def test_sunlit_positions_match_get_sunlit_times(date_str, lats, lons):
+    times = solar.get_time_series(date_str)
+    elevations = get_elevations_fast(times, lats, lons)
+
+    positions = get_sunlit_positions_fast(times, lats, lons)
+
+    for i in range(len(lats)):
+        first, last = solar.get_sunlit_times((times, elevations[:, i]))
+        assert (times[positions[i, 0]], times[positions[i, 1]]) == (first, last)
+
+
+def test_sunlit_positions_polar_night():
+    times = solar.get_time_series("2026-12-21")
+
+    positions = get_sunlit_positions_fast(times, [78.2], [15.6])
+
+    np.testing.assert_array_equal(positions, [[-1, -1]])